@@ -1,492 +1,147 @@
+import time
+import wave
+from typing import List, Optional
+
 import streamlit as st
-from typing import List
-
-# Define OOP Classes
-class Ingredient:
-    def __init__(self, name: str):
-        self.name = name.strip().lower()  # Normalize ingredient name
-
-    def __repr__(self):
-        return self.name
-
-    def __eq__(self, other):
-        if isinstance(other, Ingredient):
-            return self.name == other.name
-        return False
-
-
-class Recipe:
-    def __init__(self, name: str, ingredients: List[Ingredient], steps: str):
-        self.name = name.strip().lower()
-        self.ingredients = ingredients
-        self.steps = steps
-
-    def matches_ingredients(self, available_ingredients: List[Ingredient]) -> bool:
-        return any(ingredient in available_ingredients for ingredient in self.ingredients)
-
-    def __repr__(self):
-        return f"{self.name}: Ingredients: {[ing.name for ing in self.ingredients]}, Steps: {self.steps}"
-
-
-class AIEngine:
-    def __init__(self, recipes: List[Recipe]):
-        self.recipes = recipes
-
-    def suggest_recipes(self, available_ingredients: List[Ingredient]) -> List[Recipe]:
-        return [recipe for recipe in self.recipes if recipe.matches_ingredients(available_ingredients)]
-
-    def get_recipe_by_name(self, recipe_name: str) -> Recipe:
-        recipe_name = recipe_name.strip().lower()
-        for recipe in self.recipes:
-            if recipe.name == recipe_name:
-                return recipe
-        return None
-
-
-# Initialize Recipes Dataset
-def initialize_recipes() -> List[Recipe]:
-    return [
-    Recipe(
-        "Biryani",
-        [Ingredient("rice"), Ingredient("chicken"), Ingredient("yogurt"), Ingredient("spices"), Ingredient("onion")],
-        "1. Marinate chicken with yogurt and spices.\n2. Fry onions until golden brown.\n3. Layer rice, chicken, and fried onions in a pot.\n4. Cook on low heat until rice is fully cooked."
-    ),
-    Recipe(
-        "Fried Chicken",
-        [Ingredient("chicken pieces"), Ingredient("flour"), Ingredient("spices"), Ingredient("garlic powder"), Ingredient("oil")],
-        "1. Marinate chicken with spices and garlic powder.\n2. Coat chicken pieces in flour.\n3. Fry in hot oil until crispy."
-    ),
-    Recipe(
-        "Methi Thepla",
-        [Ingredient("fenugreek leaves"), Ingredient("flour"), Ingredient("yogurt"), Ingredient("spices"), Ingredient("oil")],
-        "1. Make dough with fenugreek leaves, flour, yogurt, and spices.\n2. Roll out into flatbreads and cook on a griddle with a little oil."
-    ),
-    Recipe(
-        "Sajji",
-        [Ingredient("whole chicken"), Ingredient("spices"), Ingredient("yogurt"), Ingredient("garlic"), Ingredient("lemon")],
-        "1. Marinate chicken with yogurt, spices, garlic, and lemon juice.\n2. Roast the whole chicken until tender."
-    ),
-    Recipe(
-        "Dahi Ke Kebab",
-        [Ingredient("yogurt"), Ingredient("paneer"), Ingredient("spices"), Ingredient("ginger"), Ingredient("cilantro")],
-        "1. Mix yogurt, paneer, and spices.\n2. Shape into kebabs and cook on a grill or fry in a pan."
-    ),
-    Recipe(
-        "Korma",
-        [Ingredient("chicken"), Ingredient("onion"), Ingredient("yogurt"), Ingredient("spices"), Ingredient("garlic")],
-        "1. Brown onions and garlic.\n2. Add chicken and spices.\n3. Cook with yogurt until tender."
-    ),
-    Recipe(
-        "Peshawari Chapli Kebab",
-        [Ingredient("minced beef"), Ingredient("onion"), Ingredient("tomato"), Ingredient("spices"), Ingredient("green chilies")],
-        "1. Mix minced beef with onions, tomatoes, chilies, and spices.\n2. Shape into patties and fry."
-    ),
-    Recipe(
-        "Lassi",
-        [Ingredient("yogurt"), Ingredient("water"), Ingredient("sugar"), Ingredient("mint")],
-        "1. Blend yogurt, water, sugar, and mint.\n2. Serve chilled."
-    ),
-    Recipe(
-        "Palak Gosht",
-        [Ingredient("mutton"), Ingredient("spinach"), Ingredient("onion"), Ingredient("garlic"), Ingredient("spices")],
-        "1. Fry onions and garlic.\n2. Add mutton and cook until browned.\n3. Add spinach and spices, cook until tender."
-    ),
-    Recipe(
-        "Bhel Puri",
-        [Ingredient("puffed rice"), Ingredient("onion"), Ingredient("tomato"), Ingredient("coriander"), Ingredient("tamarind chutney")],
-        "1. Mix puffed rice with chopped vegetables and coriander.\n2. Add tamarind chutney and spices."
-    ),
-    Recipe(
-        "Shami Kebab",
-        [Ingredient("minced meat"), Ingredient("lentils"), Ingredient("onion"), Ingredient("spices"), Ingredient("egg")],
-        "1. Cook minced meat with lentils and spices.\n2. Grind into a smooth mixture, shape into patties, and fry."
-    ),
-    Recipe(
-        "Tandoori Roti",
-        [Ingredient("flour"), Ingredient("yeast"), Ingredient("water"), Ingredient("salt"), Ingredient("ghee")],
-        "1. Make dough with yeast and flour.\n2. Roll into rotis and bake in a tandoor.\n3. Brush with ghee."
-    ),
-    Recipe(
-        "Chicken Jalfrezi",
-        [Ingredient("chicken"), Ingredient("bell peppers"), Ingredient("onion"), Ingredient("tomato"), Ingredient("spices")],
-        "1. Stir-fry chicken with onions, bell peppers, and tomatoes.\n2. Add spices and cook until tender."
-    ),
-    Recipe(
-        "Mutton Seekh Kebab",
-        [Ingredient("minced mutton"), Ingredient("onions"), Ingredient("green chilies"), Ingredient("spices"), Ingredient("coriander")],
-        "1. Mix minced mutton with onions, chilies, and spices.\n2. Shape into skewers and grill or fry."
-    ),
-    Recipe(
-        "Gajar Ka Halwa",
-        [Ingredient("carrots"), Ingredient("milk"), Ingredient("sugar"), Ingredient("ghee"), Ingredient("cardamom")],
-        "1. Grate carrots and cook them in milk.\n2. Add sugar, ghee, and cardamom, cook until thick."
-    ),
-    Recipe(
-        "Lemon Rice",
-        [Ingredient("rice"), Ingredient("lemon"), Ingredient("mustard seeds"), Ingredient("curry leaves"), Ingredient("green chilies")],
-        "1. Cook rice.\n2. Heat mustard seeds, curry leaves, and chilies.\n3. Add lemon juice to rice and mix."
-    ),
-    Recipe(
-        "Chana Chaat",
-        [Ingredient("chickpeas"), Ingredient("onion"), Ingredient("tomato"), Ingredient("cucumber"), Ingredient("spices")],
-        "1. Boil chickpeas and mix with diced veggies.\n2. Add spices and lemon juice."
-    ),
-    Recipe(
-        "Dahi Puri",
-        [Ingredient("pani puri shells"), Ingredient("yogurt"), Ingredient("potatoes"), Ingredient("tamarind chutney"), Ingredient("spices")],
-        "1. Fill puris with boiled potatoes.\n2. Add yogurt, tamarind chutney, and sprinkle with spices."
-    ),
-    Recipe(
-        "Pista Kulfi",
-        [Ingredient("milk"), Ingredient("sugar"), Ingredient("pistachios"), Ingredient("cardamom")],
-        "1. Boil milk with sugar and cardamom until thick.\n2. Add crushed pistachios and freeze in molds."
-    ),
-    Recipe(
-        "Chicken Malai Tikka",
-        [Ingredient("chicken"), Ingredient("yogurt"), Ingredient("cream"), Ingredient("spices"), Ingredient("lemon juice")],
-        "1. Marinate chicken with yogurt, cream, spices, and lemon juice.\n2. Grill the chicken until cooked."
-    ),
-    Recipe(
-        "Fish Karahi",
-        [Ingredient("fish"), Ingredient("onion"), Ingredient("tomato"), Ingredient("garlic"), Ingredient("green chilies")],
-        "1. Fry onions and garlic in oil.\n2. Add fish and cook with tomatoes and spices."
-    ),
-    Recipe(
-        "Chana Daal",
-        [Ingredient("chana daal"), Ingredient("onion"), Ingredient("tomato"), Ingredient("spices"), Ingredient("garlic")],
-        "1. Boil chana daal until tender.\n2. Fry onions and tomatoes with spices.\n3. Add to daal and cook for a few minutes."
-    ),
-    Recipe(
-        "Methi Aloo",
-        [Ingredient("potatoes"), Ingredient("fenugreek leaves"), Ingredient("onions"), Ingredient("spices")],
-        "1. Fry onions until golden.\n2. Add potatoes and spices, cook until tender.\n3. Add fenugreek leaves and cook for a few more minutes."
-    ),
-    Recipe(
-        "Samosa",
-        [Ingredient("flour"), Ingredient("potatoes"), Ingredient("peas"), Ingredient("spices"), Ingredient("oil")],
-        "1. Boil and mash potatoes and peas.\n2. Add spices and fill the mixture into rolled dough triangles.\n3. Deep fry until golden."
-    ),
-    Recipe(
-        "Vegetable Biryani",
-        [Ingredient("rice"), Ingredient("vegetables"), Ingredient("yogurt"), Ingredient("spices"), Ingredient("onion")],
-        "1. Marinate vegetables with yogurt and spices.\n2. Layer rice, vegetables, and fried onions.\n3. Cook until rice is done."
-    ),
-    Recipe(
-        "Kebabs",
-        [Ingredient("minced meat"), Ingredient("onion"), Ingredient("spices"), Ingredient("garlic")],
-        "1. Mix minced meat with spices and onions.\n2. Shape into skewers and grill or fry."
-    ),
-    Recipe(
-        "Masala Chai",
-        [Ingredient("tea leaves"), Ingredient("milk"), Ingredient("cardamom"), Ingredient("ginger"), Ingredient("sugar")],
-        "1. Boil tea leaves, ginger, and cardamom in water.\n2. Add milk and sugar, simmer until it boils."
-    ),
-    Recipe(
-        "Mutton Pulao",
-        [Ingredient("mutton"), Ingredient("rice"), Ingredient("onion"), Ingredient("garlic"), Ingredient("spices")],
-        "1. Brown mutton with onions and garlic.\n2. Add rice and spices, cook until rice is tender."
-    ),
-    Recipe(
-        "Haleem",
-        [Ingredient("wheat"), Ingredient("lentils"), Ingredient("chicken"), Ingredient("spices"), Ingredient("ghee")],
-        "1. Cook wheat and lentils until soft.\n2. Blend the mixture and add cooked chicken.\n3. Simmer with spices and ghee."
-    ),
-    Recipe(
-        "Aloo Keema",
-        [Ingredient("minced meat"), Ingredient("potatoes"), Ingredient("onion"), Ingredient("tomato"), Ingredient("spices")],
-        "1. Cook minced meat with onions, tomatoes, and spices.\n2. Add diced potatoes and cook until tender."
-    ),
-    Recipe(
-        "Zarda",
-        [Ingredient("rice"), Ingredient("sugar"), Ingredient("milk"), Ingredient("cardamom"), Ingredient("saffron")],
-        "1. Cook rice with sugar, milk, and cardamom.\n2. Add saffron and garnish with nuts."
-    ),
-    Recipe(
-        "Dahi Bhalla",
-        [Ingredient("dal"), Ingredient("yogurt"), Ingredient("tamarind chutney"), Ingredient("spices"), Ingredient("cilantro")],
-        "1. Soak dal vadas in water and top with yogurt.\n2. Add tamarind chutney and sprinkle spices."
-    ),
-    Recipe(
-        "Pani Puri",
-        [Ingredient("puri shells"), Ingredient("potatoes"), Ingredient("chickpeas"), Ingredient("spices"), Ingredient("tamarind chutney")],
-        "1. Fill puris with chickpeas and potatoes.\n2. Pour tamarind chutney and top with spices."
-    ),
-    Recipe(
-        "Shahi Malai",
-        [Ingredient("milk"), Ingredient("sugar"), Ingredient("cardamom"), Ingredient("saffron"), Ingredient("ghee")],
-        "1. Boil milk with sugar and cardamom.\n2. Garnish with saffron and ghee."
-    ),
-    Recipe(
-        "Vegetable Samosa",
-        [Ingredient("flour"), Ingredient("potatoes"), Ingredient("peas"), Ingredient("spices"), Ingredient("oil")],
-        "1. Prepare dough and roll it out.\n2. Fill with a mixture of vegetables and spices.\n3. Fry until golden."
-    ),
-    Recipe(
-        "Methi Paratha",
-        [Ingredient("flour"), Ingredient("fenugreek leaves"), Ingredient("spices"), Ingredient("ghee")],
-        "1. Make dough with fenugreek leaves, flour, and spices.\n2. Roll out into parathas and cook on a griddle with ghee."
-    ),
-    Recipe(
-        "Mutton Karahi",
-        [Ingredient("mutton"), Ingredient("onion"), Ingredient("tomato"), Ingredient("garlic"), Ingredient("spices")],
-        "1. Fry onions and garlic in oil.\n2. Add mutton and cook until browned.\n3. Add tomatoes and spices, cook until tender."
-    ),
-    Recipe(
-        "Pasta",
-        [Ingredient("pasta"), Ingredient("tomato sauce"), Ingredient("chicken"), Ingredient("garlic"), Ingredient("cheese")],
-        "1. Cook pasta.\n2. Stir-fry chicken with garlic and tomato sauce.\n3. Mix pasta with chicken and top with cheese."
-    ),
-    Recipe(
-        "Chana Daal Tikki",
-        [Ingredient("chana daal"), Ingredient("spices"), Ingredient("green chilies"), Ingredient("onions")],
-        "1. Boil chana daal and mash it.\n2. Shape into patties and fry until golden brown."
-    ),
-    Recipe(
-        "Fried Fish",
-        [Ingredient("fish"), Ingredient("spices"), Ingredient("flour"), Ingredient("oil")],
-        "1. Marinate fish with spices.\n2. Coat in flour and deep fry until crispy."
-    ),
-    Recipe(
-        "Pasta Karahi",
-        [Ingredient("pasta"), Ingredient("chicken"), Ingredient("tomato"), Ingredient("green chilies"), Ingredient("spices")],
-        "1. Cook pasta.\n2. Cook chicken with tomatoes and spices.\n3. Toss pasta in the chicken mixture."
-    ),
-    Recipe(
-        "Chana Masala",
-        [Ingredient("chickpeas"), Ingredient("onion"), Ingredient("tomato"), Ingredient("garlic"), Ingredient("spices")],
-        "1. Boil chickpeas until tender.\n2. Fry onions and tomatoes, add spices.\n3. Add chickpeas and cook together."
-    ),
-    Recipe(
-        "Bengan Bharta",
-        [Ingredient("eggplant"), Ingredient("onion"), Ingredient("tomato"), Ingredient("garlic"), Ingredient("spices")],
-        "1. Roast eggplant until soft.\n2. Mash and cook with onions, tomatoes, garlic, and spices."
-    ),
-    Recipe(
-        "Aloo Paratha",
-        [Ingredient("flour"), Ingredient("potatoes"), Ingredient("spices"), Ingredient("ghee")],
-        "1. Make dough and stuff with spiced mashed potatoes.\n2. Roll out into parathas and cook with ghee."
-    ),
-    Recipe(
-        "Seekh Kebab",
-        [Ingredient("minced meat"), Ingredient("onion"), Ingredient("green chilies"), Ingredient("spices"), Ingredient("cilantro")],
-        "1. Mix minced meat with onions, spices, and chilies.\n2. Shape into skewers and grill."
-    ),
-    Recipe(
-        "Cucumber Raita",
-        [Ingredient("yogurt"), Ingredient("cucumber"), Ingredient("spices"), Ingredient("cilantro")],
-        "1. Grate cucumber and mix with yogurt.\n2. Add spices and cilantro."
-    ),
-    Recipe(
-        "Prawn Masala",
-        [Ingredient("prawns"), Ingredient("onion"), Ingredient("tomato"), Ingredient("spices"), Ingredient("garlic")],
-        "1. Fry onions and garlic in oil.\n2. Add prawns and cook until pink.\n3. Add tomatoes and spices, cook until done."
-    ),
-    Recipe(
-        "Gulab Jamun",
-        [Ingredient("milk powder"), Ingredient("flour"), Ingredient("sugar"), Ingredient("ghee"), Ingredient("rose water")],
-        "1. Make dough with milk powder and flour.\n2. Shape into balls and fry in ghee.\n3. Soak in sugar syrup with rose water."
-    ),
-    Recipe(
-        "Kacha Gola",
-        [Ingredient("crushed ice"), Ingredient("syrup"), Ingredient("lemon juice"), Ingredient("salt")],
-        "1. Shave ice and pack it in a cup.\n2. Pour flavored syrup and sprinkle with salt."
-    ),
-
-    Recipe(
-        "Chana Chaat",
-        [Ingredient("chickpeas"), Ingredient("onion"), Ingredient("tomato"), Ingredient("cucumber"), Ingredient("spices")],
-        "1. Boil chickpeas and chop vegetables.\n2. Add spices and lemon juice.\n3. Mix well and serve."
-    ),
-    Recipe(
-        "Samosa Chaat",
-        [Ingredient("samosa"), Ingredient("yogurt"), Ingredient("chili chutney"), Ingredient("spices"), Ingredient("coriander")],
-        "1. Crush samosas.\n2. Pour yogurt and chili chutney over it.\n3. Garnish with spices and coriander."
-    ),
-    Recipe(
-        "Chicken Shawarma",
-        [Ingredient("chicken"), Ingredient("yogurt"), Ingredient("garlic"), Ingredient("spices"), Ingredient("flatbread")],
-        "1. Marinate chicken with yogurt, garlic, and spices.\n2. Grill chicken and slice thin.\n3. Serve in flatbread."
-    ),
-    Recipe(
-        "Kheer",
-        [Ingredient("milk"), Ingredient("rice"), Ingredient("sugar"), Ingredient("cardamom"), Ingredient("almonds")],
-        "1. Boil rice in milk.\n2. Add sugar, cardamom, and cook until thick.\n3. Garnish with almonds."
-    ),
-    Recipe(
-        "Chicken Pulao",
-        [Ingredient("chicken"), Ingredient("rice"), Ingredient("onion"), Ingredient("garlic"), Ingredient("spices")],
-        "1. Brown chicken with onions and garlic.\n2. Add rice and spices, cook until rice is done."
-    ),
-    Recipe(
-        "Kacha Gosht",
-        [Ingredient("mutton"), Ingredient("onions"), Ingredient("ginger"), Ingredient("garlic"), Ingredient("spices")],
-        "1. Marinate mutton with spices.\n2. Cook in a sealed pot with onions, ginger, and garlic."
-    ),
-    Recipe(
-        "Chana Daal",
-        [Ingredient("chana daal"), Ingredient("onion"), Ingredient("tomato"), Ingredient("garlic"), Ingredient("spices")],
-        "1. Boil chana daal until tender.\n2. Fry onions and tomatoes with spices.\n3. Add to daal and cook."
-    ),
-    Recipe(
-        "Shahi Korma",
-        [Ingredient("chicken"), Ingredient("yogurt"), Ingredient("cream"), Ingredient("spices"), Ingredient("onion")],
-        "1. Brown onions and cook chicken.\n2. Add yogurt, cream, and spices, cook until thick."
-    ),
-    Recipe(
-        "Egg Bhurji",
-        [Ingredient("eggs"), Ingredient("onion"), Ingredient("green chilies"), Ingredient("tomato"), Ingredient("spices")],
-        "1. Scramble eggs with onions, tomatoes, and chilies.\n2. Add spices and cook until done."
-    ),
-    Recipe(
-        "Aloo Tikki",
-        [Ingredient("potatoes"), Ingredient("onion"), Ingredient("spices"), Ingredient("green chilies"), Ingredient("oil")],
-        "1. Boil and mash potatoes.\n2. Shape into patties with onions, chilies, and spices.\n3. Fry until golden."
-    ),
-    Recipe(
-        "Mango Lassi",
-        [Ingredient("mango"), Ingredient("yogurt"), Ingredient("milk"), Ingredient("sugar")],
-        "1. Blend mango, yogurt, milk, and sugar.\n2. Serve chilled."
-    ),
-    Recipe(
-        "Chicken Korma",
-        [Ingredient("chicken"), Ingredient("yogurt"), Ingredient("spices"), Ingredient("onion"), Ingredient("garlic")],
-        "1. Fry onions and garlic.\n2. Add chicken and spices, cook until browned.\n3. Add yogurt and simmer."
-    ),
-    Recipe(
-        "Nihari",
-        [Ingredient("mutton"), Ingredient("onion"), Ingredient("spices"), Ingredient("flour"), Ingredient("garlic")],
-        "1. Cook mutton with onions, garlic, and spices.\n2. Thicken with flour and cook until tender."
-    ),
-    Recipe(
-        "Masala Dosa",
-        [Ingredient("rice flour"), Ingredient("potatoes"), Ingredient("onion"), Ingredient("spices"), Ingredient("oil")],
-        "1. Make a dosa batter from rice flour.\n2. Cook a spiced potato filling.\n3. Serve dosa with filling."
-    ),
-    Recipe(
-        "Gulab Jamun",
-        [Ingredient("milk powder"), Ingredient("flour"), Ingredient("sugar"), Ingredient("ghee"), Ingredient("rose water")],
-        "1. Make dough with milk powder and flour.\n2. Shape into balls and fry in ghee.\n3. Soak in sugar syrup with rose water."
-    ),
-    Recipe(
-        "Haleem",
-        [Ingredient("wheat"), Ingredient("lentils"), Ingredient("chicken"), Ingredient("spices"), Ingredient("ghee")],
-        "1. Cook wheat and lentils until soft.\n2. Blend the mixture and add cooked chicken.\n3. Simmer with spices and ghee."
-    ),
-    Recipe(
-        "Baked Chicken Wings",
-        [Ingredient("chicken wings"), Ingredient("garlic powder"), Ingredient("paprika"), Ingredient("spices"), Ingredient("oil")],
-        "1. Season chicken wings with garlic, paprika, and spices.\n2. Bake in the oven until crispy."
-    ),
-    Recipe(
-        "Gajar Halwa",
-        [Ingredient("carrots"), Ingredient("milk"), Ingredient("sugar"), Ingredient("ghee"), Ingredient("cardamom")],
-        "1. Grate carrots and cook them in milk.\n2. Add sugar, ghee, and cardamom, cook until thick."
-    ),
-    Recipe(
-        "Chana Masala",
-        [Ingredient("chickpeas"), Ingredient("onion"), Ingredient("tomato"), Ingredient("garlic"), Ingredient("spices")],
-        "1. Boil chickpeas until tender.\n2. Fry onions and tomatoes, add spices.\n3. Add chickpeas and cook together."
-    ),
-    Recipe(
-        "Keema Paratha",
-        [Ingredient("flour"), Ingredient("minced meat"), Ingredient("onion"), Ingredient("spices"), Ingredient("ghee")],
-        "1. Cook minced meat with spices and onions.\n2. Stuff the mixture in paratha dough and cook with ghee."
-    ),
-    Recipe(
-        "Biryani",
-        [Ingredient("rice"), Ingredient("chicken"), Ingredient("yogurt"), Ingredient("spices"), Ingredient("onion")],
-        "1. Marinate chicken with yogurt and spices.\n2. Fry onions until golden brown.\n3. Layer rice, chicken, and fried onions in a pot.\n4. Cook on low heat until rice is fully cooked."
-    ),
-    Recipe(
-        "Kofta Curry",
-        [Ingredient("minced meat"), Ingredient("onion"), Ingredient("spices"), Ingredient("garlic"), Ingredient("yogurt")],
-        "1. Make meatballs with minced meat, onions, and spices.\n2. Fry meatballs and add to curry made from garlic, onions, and yogurt."
-    ),
-    Recipe(
-        "Gosht Karahi",
-        [Ingredient("mutton"), Ingredient("onion"), Ingredient("tomato"), Ingredient("green chilies"), Ingredient("spices")],
-        "1. Fry onions and tomatoes.\n2. Add mutton and cook with spices.\n3. Simmer until tender."
-    ),
-    Recipe(
-        "Aloo Keema",
-        [Ingredient("minced meat"), Ingredient("potatoes"), Ingredient("onion"), Ingredient("tomato"), Ingredient("spices")],
-        "1. Cook minced meat with onions, tomatoes, and spices.\n2. Add diced potatoes and cook until tender."
-    ),
-    Recipe(
-        "Mutton Seekh Kebab",
-        [Ingredient("minced mutton"), Ingredient("onions"), Ingredient("green chilies"), Ingredient("spices"), Ingredient("cilantro")],
-        "1. Mix minced mutton with onions, chilies, and spices.\n2. Shape into skewers and grill or fry."
-    ),
-    Recipe(
-        "Methi Paratha",
-        [Ingredient("flour"), Ingredient("fenugreek leaves"), Ingredient("spices"), Ingredient("ghee")],
-        "1. Make dough with fenugreek leaves and spices.\n2. Roll into parathas and cook on a griddle with ghee."
-    ),
-    Recipe(
-        "Pista Kulfi",
-        [Ingredient("milk"), Ingredient("sugar"), Ingredient("pistachios"), Ingredient("cardamom")],
-        "1. Boil milk with sugar and cardamom until thick.\n2. Add crushed pistachios and freeze in molds."
-    ),
-    Recipe(
-        "Chana Daal Tikki",
-        [Ingredient("chana daal"), Ingredient("spices"), Ingredient("green chilies"), Ingredient("onions")],
-        "1. Boil chana daal and mash it.\n2. Shape into patties and fry until golden brown."
-    ),
-    Recipe(
-        "Pasta Karahi",
-        [Ingredient("pasta"), Ingredient("chicken"), Ingredient("tomato"), Ingredient("green chilies"), Ingredient("spices")],
-        "1. Cook pasta.\n2. Cook chicken with tomatoes and spices.\n3. Toss pasta in the chicken mixture."
-    ),
-    Recipe(
-        "Dahi Bhalla",
-        [Ingredient("dal"), Ingredient("yogurt"), Ingredient("tamarind chutney"), Ingredient("spices"), Ingredient("cilantro")],
-        "1. Soak dal vadas in water and top with yogurt.\n2. Add tamarind chutney and sprinkle spices."
-    ),
-    Recipe(
-        "Fried Fish",
-        [Ingredient("fish"), Ingredient("spices"), Ingredient("flour"), Ingredient("oil")],
-        "1. Marinate fish with spices.\n2. Coat in flour and deep fry until crispy."
-    ),
-    Recipe(
-        "Tandoori Roti",
-        [Ingredient("flour"), Ingredient("yeast"), Ingredient("water"), Ingredient("salt"), Ingredient("ghee")],
-        "1. Make dough with yeast and flour.\n2. Roll into rotis and bake in a tandoor.\n3. Brush with ghee."
-    ),
-    Recipe(
-        "Bhel Puri",
-        [Ingredient("puffed rice"), Ingredient("onion"), Ingredient("tomato"), Ingredient("coriander"), Ingredient("tamarind chutney")],
-        "1. Mix puffed rice with chopped vegetables and coriander.\n2. Add tamarind chutney and spices."
-    ),
-    Recipe(
-        "Pulao",
-        [Ingredient("rice"), Ingredient("meat"), Ingredient("onion"), Ingredient("spices")],
-        "1. Brown meat and onion.\n2. Add rice and spices, cook until rice is tender."
-    ),
-    Recipe(
-        "Chana Pulao",
-        [Ingredient("rice"), Ingredient("chickpeas"), Ingredient("onion"), Ingredient("spices")],
-        "1. Cook chickpeas with onions and spices.\n2. Add rice and cook until tender."
-    ),
-    Recipe(
-        "Sajji",
-        [Ingredient("whole chicken"), Ingredient("spices"), Ingredient("yogurt"), Ingredient("garlic"), Ingredient("lemon")],
-        "1. Marinate chicken with yogurt, spices, garlic, and lemon juice.\n2. Roast the whole chicken until tender."
-    ),
-    Recipe(
-        "Dahi Ke Kebab",
-        [Ingredient("yogurt"), Ingredient("paneer"), Ingredient("spices"), Ingredient("ginger"), Ingredient("cilantro")],
-        "1. Mix yogurt, paneer, and spices.\n2. Shape into kebabs and cook on a grill or fry in a pan."
-    ),
-    Recipe(
-        "Lassi",
-        [Ingredient("yogurt"), Ingredient("water"), Ingredient("sugar"), Ingredient("mint")],
-        "1. Blend yogurt, water, sugar, and mint.\n2. Serve chilled."
-    ),
-]
+
+from recipe_core import (
+    MAX_NAME_TYPOS,
+    RECIPE_CATALOG_PATH,
+    SCORING_METHODS,
+    CachedAIEngine,
+    Ingredient,
+    QueryConstraints,
+    catalog_fingerprint,
+    create_engine,
+    metrics,
+)
+from recipe_voice import VOICE_RECORD_SECONDS, VOICE_SAMPLE_RATE, microphone_chunks, recognize_ingredients, wav_chunks
+
+PAGE_SIZE = 10
+
+
+# Built once per server process and shared by every session; a new fingerprint replaces the cached engine
+@st.cache_resource(max_entries=1, show_spinner="Loading recipe catalog...")
+def load_engine(catalog_version: str, path: Optional[str] = RECIPE_CATALOG_PATH) -> CachedAIEngine:
+    return create_engine(path, warm_indexes=True)
+
+
+def show_rerun_metric(rerun_started: float):
+    elapsed_ms = (time.perf_counter() - rerun_started) * 1000
+    previous_ms = st.session_state.get("last_rerun_ms")
+    delta = None if previous_ms is None else f"{elapsed_ms - previous_ms:+.1f} ms"
+    st.sidebar.metric("Rerun time", f"{elapsed_ms:.1f} ms", delta=delta, delta_color="inverse")
+    st.session_state["last_rerun_ms"] = elapsed_ms
+
+
+def show_metrics():
+    with st.sidebar.expander("📈 Metrics"):
+        st.json(metrics.snapshot(), expanded=False)
+        st.download_button("Prometheus text", metrics.to_prometheus(), file_name="recipe-metrics.txt")
+
+
+def show_cache_stats(engine: CachedAIEngine):
+    info = engine.cache_info()
+    lookups = info["hits"] + info["misses"]
+    hit_rate = info["hits"] / lookups if lookups else 0.0
+    st.sidebar.caption(
+        f"Query cache: {info['hits']} hits / {info['misses']} misses ({hit_rate:.0%}), {info['size']} entries, "
+        f"{info['coalesced']} coalesced, {info['pinned']} warmed"
+    )
+
+
+def render_voice_input(engine: CachedAIEngine, scoring: str):
+    with st.expander("🎤 Voice input"):
+        audio_file = st.file_uploader("Spoken ingredient list (mono 16-bit WAV):", type=["wav"])
+        upload_column, microphone_column = st.columns(2)
+        recognize_upload = upload_column.button("🎧 Recognize upload", disabled=audio_file is None)
+        record = microphone_column.button(f"🎙️ Record {VOICE_RECORD_SECONDS} s")
+        if not (recognize_upload or record):
+            return
+        try:
+            with st.spinner("Listening..."):
+                if recognize_upload:
+                    with wave.open(audio_file, "rb") as wav_file:
+                        transcript, ingredients = recognize_ingredients(engine, wav_chunks(wav_file), wav_file.getframerate())
+                else:
+                    transcript, ingredients = recognize_ingredients(engine, microphone_chunks(), VOICE_SAMPLE_RATE)
+        except Exception as error:  # Missing model files, audio device or malformed WAV
+            st.error(f"❌ Voice input failed: {error}")
+            return
+        if not ingredients:
+            st.error("❌ No ingredients recognized, please try again.")
+            return
+        st.info(f"Heard: {', '.join(ingredient.name for ingredient in ingredients)}")
+        engine.record_query(ingredients)
+        st.session_state["query"] = {
+            "ingredients": [ingredient.name for ingredient in ingredients],
+            "recipe_name": "",
+            "scoring": scoring,
+        }
+        st.session_state["page"] = 0
+
+
+def change_page(step: int):
+    st.session_state["page"] = max(0, st.session_state.get("page", 0) + step)
+
+
+def render_suggestion_page(
+    engine: CachedAIEngine, ingredients: List[Ingredient], scoring: str, constraints: Optional[QueryConstraints] = None
+):
+    # Ranked only up to the current page (plus one to detect a next page) through the shared cache,
+    # so sessions asking the same thing at once share one computation; steps are split and
+    # rendered only for recipes the user opens
+    page = st.session_state.get("page", 0)
+    start = page * PAGE_SIZE
+    results = engine.rank_recipes(ingredients, start + PAGE_SIZE + 1, scoring, constraints)[start:]
+    if not results:
+        if page:
+            st.session_state["page"] = 0
+            st.rerun()
+        st.error("❌ No recipes found for the given ingredients.")
+        return
+
+    st.subheader("🍽️ Suggested Recipes:")
+    for position, (recipe, score) in enumerate(results[:PAGE_SIZE], start + 1):
+        st.markdown(f"### 🍲 {recipe.name.title()}")
+        st.caption(f"#{position} · Match score ({scoring}): {score:.0%}")
+        st.markdown(f"**Ingredients:** {', '.join(recipe.ingredient_labels)}")
+        if st.toggle("Show steps", key=f"steps-{position}-{recipe.name}"):
+            st.markdown('<div class="steps-title">Steps:</div>', unsafe_allow_html=True)
+            for step in recipe.steps.split("\n"):
+                st.markdown(f"{step}")
+        st.divider()
+
+    previous_column, page_column, next_column = st.columns([1, 2, 1])
+    previous_column.button("⬅️ Previous", on_click=change_page, args=(-1,), disabled=page == 0)
+    page_column.caption(f"Page {page + 1}")
+    next_column.button("Next ➡️", on_click=change_page, args=(1,), disabled=len(results) <= PAGE_SIZE)
+
+
+def render_step_results(
+    engine: CachedAIEngine, text: str, ingredients: List[Ingredient], constraints: Optional[QueryConstraints]
+):
+    results = engine.search_recipes(text, PAGE_SIZE, ingredients, constraints)
+    if not results:
+        st.error("❌ No recipe steps match the search.")
+        return
+
+    st.subheader("🔎 Matching Recipes:")
+    for position, (recipe, score) in enumerate(results, 1):
+        st.markdown(f"### 🍲 {recipe.name.title()}")
+        st.caption(f"#{position} · Text relevance: {score:.2f}")
+        st.markdown(f"**Ingredients:** {', '.join(recipe.ingredient_labels)}")
+        if st.toggle("Show steps", key=f"search-steps-{position}-{recipe.name}"):
+            st.markdown('<div class="steps-title">Steps:</div>', unsafe_allow_html=True)
+            for step in recipe.steps.split("\n"):
+                st.markdown(f"{step}")
+        st.divider()
 
 
 # Streamlit Frontend
 def main():
+    rerun_started = time.perf_counter()
+
     # Apply custom styles for a refined UI
     st.markdown(
         """
@@ -529,9 +184,10 @@ def main():
 
     st.title("🍽️ AI Recipe Maker | A Project by MindFlow Solutions 🌟")
 
-    # Initialize recipes dataset
-    recipes = initialize_recipes()
-    engine = AIEngine(recipes)
+    # Shared recipe engine; the sidebar button drops it so the next rerun rebuilds from the catalog source
+    if st.sidebar.button("🔄 Reload catalog"):
+        load_engine.clear()
+    engine = load_engine(catalog_fingerprint())
 
     # User input for ingredients and recipe name
     st.header("Find Recipes by Ingredients or by Name")
@@ -546,40 +202,81 @@ def main():
         st.markdown("#### Enter Recipe Name (Optional)")
         user_input_recipe_name = st.text_input("Recipe Name:", placeholder="e.g., Biryani")
 
+        st.markdown("#### Search Steps (Optional)")
+        user_input_steps = st.text_input(
+            'Steps mention (use quotes for exact phrases):', placeholder='e.g., fry "low heat"'
+        )
+
+        scoring = st.selectbox("Rank suggestions by:", SCORING_METHODS)
+
+        with st.expander("Filters"):
+            max_missing = st.selectbox("Missing ingredients allowed:", ["Any", 0, 1, 2, 3])
+            required_input = st.text_input("Must include (comma-separated):", placeholder="e.g., chicken")
+            excluded_input = st.text_input("Exclude (comma-separated):", placeholder="e.g., peanuts, milk")
+
         # Add a submit button to trigger the form submission
         submit_button = st.form_submit_button(label="🔍 Get Recipe")
 
-    # Handle form submission logic
+    # Handle form submission logic; the query is kept in session state so paging and
+    # "Show steps" reruns keep rendering the same results
     if submit_button:
+        st.session_state["query"] = {
+            "ingredients": [ing.strip() for ing in user_input_ingredients.split(",") if ing.strip()],
+            "recipe_name": user_input_recipe_name.strip(),
+            "steps_query": user_input_steps.strip(),
+            "scoring": scoring,
+            "max_missing": None if max_missing == "Any" else max_missing,
+            "required": [ing.strip() for ing in required_input.split(",") if ing.strip()],
+            "excluded": [ing.strip() for ing in excluded_input.split(",") if ing.strip()],
+        }
+        st.session_state["page"] = 0
+        # Logged once per submission; paging and "Show steps" reruns repeat the query without logging it
+        engine.record_query([Ingredient.query(name) for name in st.session_state["query"]["ingredients"]])
+
+    render_voice_input(engine, scoring)
+
+    query = st.session_state.get("query")
+    if query:
         # Process the search logic
-        ingredients = [Ingredient(ing.strip()) for ing in user_input_ingredients.split(",") if ing.strip()]
-        recipe_name = user_input_recipe_name.strip()
+        ingredients = [Ingredient.query(name) for name in query["ingredients"]]
+        recipe_name = query["recipe_name"]
 
         if recipe_name:  # Search by recipe name
-            recipe = engine.get_recipe_by_name(recipe_name)
+            recipe = engine.get_recipe_by_name(recipe_name, max_distance=MAX_NAME_TYPOS)
             if recipe:
                 st.subheader(f"🍴 {recipe.name.title()} 🍴")
-                st.markdown(f"**Ingredients:** {', '.join([ing.name for ing in recipe.ingredients])}")
+                st.markdown(f"**Ingredients:** {', '.join(recipe.ingredient_labels)}")
                 st.markdown('<div class="steps-title">Steps:</div>', unsafe_allow_html=True)
                 for step in recipe.steps.split("\n"):
                     st.markdown(f"- {step}")
+                similar = engine.similar_recipes(recipe.name)
+                if similar:
+                    st.markdown("#### 🍱 More like this")
+                    for other, similarity in similar:
+                        st.markdown(f"- **{other.name.title()}** · {similarity:.0%} ingredient overlap")
             else:
                 st.error("❌ No recipe found with the given name.")
-        elif ingredients:  # Search by ingredients
-            suggested_recipes = engine.suggest_recipes(ingredients)
-            if suggested_recipes:
-                st.subheader("🍽️ Suggested Recipes:")
-                for recipe in suggested_recipes:
-                    st.markdown(f"### 🍲 {recipe.name.title()}")
-                    st.markdown(f"**Ingredients:** {', '.join([ing.name for ing in recipe.ingredients])}")
-                    st.markdown('<div class="steps-title">Steps:</div>', unsafe_allow_html=True)
-                    for step in recipe.steps.split("\n"):
-                        st.markdown(f"{step}")
-                    st.divider()
+        elif query.get("steps_query") or ingredients:
+            try:
+                constraints = QueryConstraints(
+                    query.get("max_missing"),
+                    [Ingredient.query(name) for name in query.get("required", [])],
+                    [Ingredient.query(name) for name in query.get("excluded", [])],
+                )
+            except ValueError as error:
+                st.error(f"⚠️ {error}")
             else:
-                st.error("❌ No recipes found for the given ingredients.")
+                with metrics.timer("render_results"):
+                    if query.get("steps_query"):  # Search the steps, narrowed by any ingredients and filters
+                        render_step_results(engine, query["steps_query"], ingredients, constraints)
+                    else:  # Search by ingredients
+                        render_suggestion_page(engine, ingredients, query["scoring"], constraints)
         else:
-            st.error("⚠️ Please enter at least one ingredient or a recipe name.")
+            st.error("⚠️ Please enter at least one ingredient, a recipe name or a steps search.")
+
+    show_cache_stats(engine)
+    show_metrics()
+    show_rerun_metric(rerun_started)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,186 @@
+"""Headless JSON API over the recipe engine.
+
+Usage: python api_server.py [--port 8000] [--catalog recipes.jsonl|catalog.snapshot]
+
+GET /health
+GET /metrics[?format=json]
+GET /recipes/suggest?ingredients=rice,chicken&top_k=10&scoring=coverage[&max_missing=1&require=chicken&exclude=peanuts]
+GET /recipes/search?q="low heat" fry&ingredients=rice&top_k=10[&max_missing=1&require=chicken&exclude=peanuts]
+GET /recipes/by-name?name=biryani&max_distance=2   (max_distance <= MAX_NAME_TYPOS)
+GET /recipes/similar?name=biryani&top_k=5
+GET /recipes/complete?prefix=chi&limit=10
+"""
+import argparse
+import asyncio
+import functools
+import json
+
+import tornado.web
+
+import recipe_core as core
+
+
+def recipe_to_json(recipe, score=None, include_steps=False) -> dict:
+    payload = {"name": recipe.name, "ingredients": recipe.ingredient_labels}
+    if score is not None:
+        payload["score"] = round(score, 4)
+    if include_steps:
+        payload["steps"] = recipe.steps.split("\n")
+    return payload
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, engine):
+        self.engine = engine
+
+    def set_default_headers(self):
+        self.set_header("Content-Type", "application/json; charset=utf-8")
+
+    def write_json(self, payload, status=200):
+        self.set_status(status)
+        self.finish(json.dumps(payload))
+
+    def int_argument(self, name, default, minimum=0, maximum=None):
+        value = self.get_query_argument(name, None)
+        if value is None:
+            return default
+        try:
+            number = int(value)
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason=f"{name} must be an integer")
+        if number < minimum:
+            raise tornado.web.HTTPError(400, reason=f"{name} must be >= {minimum}")
+        if maximum is not None and number > maximum:
+            raise tornado.web.HTTPError(400, reason=f"{name} must be at most {maximum}")
+        return number
+
+    def list_argument(self, name):
+        return [value.strip() for value in self.get_query_argument(name, "").split(",") if value.strip()]
+
+    def constraints(self):
+        try:
+            return core.QueryConstraints(
+                self.int_argument("max_missing", None),
+                [core.Ingredient.query(name) for name in self.list_argument("require")],
+                [core.Ingredient.query(name) for name in self.list_argument("exclude")],
+            )
+        except ValueError as error:
+            raise tornado.web.HTTPError(400, reason=str(error))
+
+    def write_error(self, status_code, **kwargs):
+        self.finish(json.dumps({"error": self._reason}))
+
+    async def run_query(self, function, *args):
+        # Ranking a large catalog takes tens of milliseconds, so engine queries run on the default
+        # thread pool instead of blocking every other connection on the event loop. The engine is
+        # safe to share: updates swap whole indexes and the query cache takes its own lock.
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(function, *args))
+
+
+# Health and metrics are cheap reads and stay on the event loop; anything that may build an index
+# or touch the disk goes through run_query
+class HealthHandler(BaseHandler):
+    async def get(self):
+        self.write_json({"status": "ok", "recipes": self.engine.recipe_count, **self.engine.cache_info()})
+
+
+class MetricsHandler(BaseHandler):
+    async def get(self):
+        if self.get_query_argument("format", "prometheus") == "json":
+            self.finish(core.metrics.to_json())
+        else:
+            self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.finish(core.metrics.to_prometheus())
+
+
+class SuggestHandler(BaseHandler):
+    async def get(self):
+        names = self.list_argument("ingredients")
+        if not names:
+            raise tornado.web.HTTPError(400, reason="ingredients is required")
+        scoring = self.get_query_argument("scoring", "coverage")
+        if scoring not in core.SCORING_METHODS:
+            raise tornado.web.HTTPError(400, reason=f"scoring must be one of {', '.join(core.SCORING_METHODS)}")
+        top_k = self.int_argument("top_k", core.MAX_SUGGESTIONS, minimum=1)
+        ingredients = [core.Ingredient.query(name) for name in names]
+        constraints = self.constraints()
+        await self.run_query(self.engine.record_query, ingredients)  # Appends to the query log file
+        ranked = await self.run_query(self.engine.rank_recipes, ingredients, top_k, scoring, constraints)
+        self.write_json({"results": [recipe_to_json(recipe, score) for recipe, score in ranked]})
+
+
+class SearchHandler(BaseHandler):
+    async def get(self):
+        text = self.get_query_argument("q", "").strip()
+        if not text:
+            raise tornado.web.HTTPError(400, reason="q is required")
+        top_k = self.int_argument("top_k", core.MAX_SUGGESTIONS, minimum=1)
+        ingredients = [core.Ingredient.query(name) for name in self.list_argument("ingredients")]
+        ranked = await self.run_query(self.engine.search_recipes, text, top_k, ingredients, self.constraints())
+        self.write_json({"results": [recipe_to_json(recipe, score) for recipe, score in ranked]})
+
+
+class ByNameHandler(BaseHandler):
+    async def get(self):
+        name = self.get_query_argument("name", "").strip()
+        if not name:
+            raise tornado.web.HTTPError(400, reason="name is required")
+        # Capped: a large distance turns the fuzzy lookup into a brute-force pass over every name
+        max_distance = self.int_argument("max_distance", 0, maximum=core.MAX_NAME_TYPOS)
+        recipe = await self.run_query(self.engine.get_recipe_by_name, name, max_distance)
+        if recipe is None:
+            raise tornado.web.HTTPError(404, reason="No recipe found with the given name")
+        self.write_json(recipe_to_json(recipe, include_steps=True))
+
+
+class SimilarHandler(BaseHandler):
+    async def get(self):
+        name = self.get_query_argument("name", "").strip()
+        if not name:
+            raise tornado.web.HTTPError(400, reason="name is required")
+        if await self.run_query(self.engine.get_recipe_by_name, name) is None:
+            raise tornado.web.HTTPError(404, reason="No recipe found with the given name")
+        top_k = self.int_argument("top_k", core.SIMILAR_RECIPES, minimum=1)
+        similar = await self.run_query(self.engine.similar_recipes, name, top_k)
+        self.write_json({"results": [recipe_to_json(recipe, score) for recipe, score in similar]})
+
+
+class CompleteHandler(BaseHandler):
+    async def get(self):
+        prefix = self.get_query_argument("prefix", "")
+        limit = self.int_argument("limit", 10, minimum=1)
+        self.write_json({"names": await self.run_query(self.engine.complete_recipe_names, prefix, limit)})
+
+
+def make_app(engine) -> tornado.web.Application:
+    handler_args = {"engine": engine}
+    return tornado.web.Application(
+        [
+            (r"/health", HealthHandler, handler_args),
+            (r"/metrics", MetricsHandler, handler_args),
+            (r"/recipes/suggest", SuggestHandler, handler_args),
+            (r"/recipes/search", SearchHandler, handler_args),
+            (r"/recipes/by-name", ByNameHandler, handler_args),
+            (r"/recipes/similar", SimilarHandler, handler_args),
+            (r"/recipes/complete", CompleteHandler, handler_args),
+        ]
+    )
+
+
+async def serve(port: int, catalog_path):
+    engine = core.create_engine(catalog_path, warm_indexes=True)  # One shared engine for the whole process
+    make_app(engine).listen(port)
+    print(f"Serving {engine.recipe_count} recipes on http://localhost:{port}")
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless JSON API over the recipe engine")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--catalog", default=core.RECIPE_CATALOG_PATH, help=".jsonl, .csv, .parquet or .snapshot file")
+    args = parser.parse_args()
+    asyncio.run(serve(args.port, args.catalog))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Measure worker cold start: module import time and time to a first query.
+
+Usage: python benchmarks/bench_import.py [--repeat 10] [--targets core,engine,api,ui] [--output results.json]
+
+Every sample runs in a fresh interpreter, so nothing is shared between runs. For each target the
+JSON output has the median and worst in-process time and whole-process wall time. It also lists
+the slowest imports from one `python -X importtime` run, leaving out interpreter startup.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+TARGETS = {
+    "core": "import recipe_core",
+    "engine": (
+        "import recipe_core; engine = recipe_core.create_engine(None); "
+        "engine.suggest_recipes([recipe_core.Ingredient('rice')])"
+    ),
+    "api": "import api_server",
+    "ui": (
+        "import importlib.util; "
+        "spec = importlib.util.spec_from_file_location('recipe_ui', 'ai-recipe-generator.py'); "
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+    ),
+}
+CHILD = "import time; started = time.perf_counter(); {statement}; print(time.perf_counter() - started)"
+
+
+def run_child(statement, extra_args=()):
+    return subprocess.run(
+        [sys.executable, *extra_args, "-c", CHILD.format(statement=statement)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+
+
+def import_times(statement):
+    # -X importtime lines: "import time: self [us] | cumulative | <indent>package"
+    stderr = run_child(statement, ["-X", "importtime"]).stderr
+    times = {}
+    for line in stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            times[parts[2].strip()] = int(parts[1])
+    return times
+
+
+def slowest_imports(statement, limit):
+    startup = import_times("pass")  # Interpreter startup (site, encodings, ...) is not ours to trim
+    imports = [(micros, name) for name, micros in import_times(statement).items() if name not in startup]
+    return [{"module": name, "cumulative_ms": micros / 1e3} for micros, name in sorted(imports, reverse=True)[:limit]]
+
+
+def measure(statement, repeat):
+    in_process, wall = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = run_child(statement)
+        wall.append(time.perf_counter() - started)
+        in_process.append(float(completed.stdout.strip().splitlines()[-1]))
+    return {
+        "in_process_ms": {"median": statistics.median(in_process) * 1e3, "max": max(in_process) * 1e3},
+        "process_ms": {"median": statistics.median(wall) * 1e3, "max": max(wall) * 1e3},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the recipe modules")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--targets", default=",".join(TARGETS), help=f"comma-separated subset of {tuple(TARGETS)}")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per target")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    targets = [target for target in args.targets.split(",") if target]
+    unknown = set(targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"unknown targets: {', '.join(sorted(unknown))}")
+    results = []
+    for target in targets:
+        run_child(TARGETS[target])  # Warm the bytecode cache so every sample sees the same state
+        result = {"target": target, **measure(TARGETS[target], args.repeat)}
+        result["slowest_imports"] = slowest_imports(TARGETS[target], args.top)
+        results.append(result)
+        print(f"{target:<8} {result['in_process_ms']['median']:>9.1f} ms median import", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Benchmark recipe engines on synthetic Zipfian catalogs.
+
+Usage: python benchmarks/bench_suite.py [--sizes 1000,100000] [--engines aiengine,listscan,vectorized]
+                                        [--queries 500] [--output results.json]
+
+Every (engine, size) pair runs in its own subprocess so peak RSS is measured in isolation.
+Results are printed (or written) as a JSON list with one object per pair.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+import recipe_core as core  # noqa: E402
+from synthetic_catalog import generate_pantries, generate_recipes  # noqa: E402
+
+ENGINES = ("aiengine", "listscan", "vectorized")
+
+
+class ListScanEngine:
+    # The original engine: a full scan of the recipe list on every call, testing each recipe
+    # ingredient for membership in the pantry list. Written out here rather than calling
+    # Recipe.matches_ingredients, which now decodes ids and builds a set per call.
+    def __init__(self, recipes):
+        self.recipes = list(recipes)
+        self.ingredient_lists = [recipe.ingredients for recipe in self.recipes]
+
+    def suggest_recipes(self, available_ingredients):
+        return [
+            recipe
+            for recipe, ingredients in zip(self.recipes, self.ingredient_lists)
+            if any(ingredient in available_ingredients for ingredient in ingredients)
+        ]
+
+    def get_recipe_by_name(self, recipe_name):
+        recipe_name = recipe_name.strip().lower()
+        for recipe in self.recipes:
+            if recipe.name == recipe_name:
+                return recipe
+        return None
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def latency_stats(fn, inputs):
+    samples = []
+    started = time.perf_counter()
+    for item in inputs:
+        call_started = time.perf_counter()
+        fn(item)
+        samples.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    return {
+        "calls": len(samples),
+        "p50_ms": samples[len(samples) // 2] * 1e3,
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e3,
+        "throughput_per_s": len(samples) / elapsed if elapsed else None,
+    }
+
+
+def run_single(engine_name, size, queries, seed):
+    started = time.perf_counter()
+    recipes = [
+        core.Recipe(name, [core.Ingredient(ingredient) for ingredient in ingredients], steps)
+        for name, ingredients, steps in generate_recipes(size, seed=seed)
+    ]
+    generate_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if engine_name == "aiengine":
+        engine = core.AIEngine(recipes)
+        # The name index is built lazily; build it here so the first name lookup sample doesn't pay for it
+        engine.name_index
+    elif engine_name == "vectorized":
+        from vector_engine import VectorizedAIEngine
+
+        engine = VectorizedAIEngine(recipes)
+    else:
+        engine = ListScanEngine(recipes)
+    build_seconds = time.perf_counter() - started
+
+    rng = random.Random(seed)
+    pantries = [[core.Ingredient(name) for name in pantry] for pantry in generate_pantries(queries, seed=seed + 1)]
+    names = [recipes[rng.randrange(len(recipes))].name for _ in range(queries)]
+    result = {
+        "engine": engine_name,
+        "recipes": size,
+        "generate_seconds": generate_seconds,
+        "build_seconds": build_seconds,
+        "suggest_recipes": latency_stats(engine.suggest_recipes, pantries),
+        "get_recipe_by_name": latency_stats(engine.get_recipe_by_name, names),
+    }
+    if hasattr(engine, "rank_recipes"):
+        result["rank_recipes_top10"] = latency_stats(lambda pantry: engine.rank_recipes(pantry, 10), pantries)
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recipe engines on synthetic catalogs")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma-separated catalog sizes")
+    parser.add_argument("--engines", default=",".join(ENGINES), help=f"comma-separated subset of {ENGINES}")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--single", nargs=2, metavar=("ENGINE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_single(args.single[0], int(args.single[1]), args.queries, args.seed)))
+        return
+
+    engines = [engine for engine in args.engines.split(",") if engine]
+    unknown = set(engines) - set(ENGINES)
+    if unknown:
+        parser.error(f"unknown engines: {', '.join(sorted(unknown))}")
+    results = []
+    for size in (int(size) for size in args.sizes.split(",") if size):
+        for engine in engines:
+            completed = subprocess.run(
+                [sys.executable, __file__, "--single", engine, str(size), "--queries", str(args.queries),
+                 "--seed", str(args.seed)],
+                capture_output=True, text=True, check=True,
+            )
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+            print(f"{engine:<11} {size:>10} recipes done", file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
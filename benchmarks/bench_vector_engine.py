@@ -0,0 +1,78 @@
+"""Compare the vectorized engine against the list-scan and inverted-index paths.
+
+Usage: python benchmarks/bench_vector_engine.py [--recipes 100000] [--queries 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from recipe_core import AIEngine, Ingredient, Recipe, initialize_recipes  # noqa: E402
+from vector_engine import VectorizedAIEngine  # noqa: E402
+
+
+def synthetic_catalog(size, rng):
+    base = initialize_recipes()
+    vocabulary = sorted({ing.name for recipe in base for ing in recipe.ingredients})
+    return [
+        Recipe(
+            f"recipe {i}",
+            [Ingredient(name) for name in rng.sample(vocabulary, rng.randint(3, 8))],
+            base[i % len(base)].steps,
+        )
+        for i in range(size)
+    ], vocabulary
+
+
+def timed(label, fn, queries, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            fn(query)
+    elapsed = time.perf_counter() - start
+    calls = len(queries) * repeat
+    print(f"{label:<28} {elapsed / calls * 1e3:>10.3f} ms/query {calls / elapsed:>12.1f} queries/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    recipes, vocabulary = synthetic_catalog(args.recipes, rng)
+    queries = [[Ingredient(name) for name in rng.sample(vocabulary, rng.randint(2, 6))] for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index_engine = AIEngine(recipes)
+    print(f"{'build AIEngine':<28} {time.perf_counter() - start:>10.3f} s")
+    start = time.perf_counter()
+    vector_engine = VectorizedAIEngine(recipes)
+    print(f"{'build VectorizedAIEngine':<28} {time.perf_counter() - start:>10.3f} s")
+
+    # The original list scan, written out: Recipe.matches_ingredients now decodes ids and builds a set per call
+    ingredient_lists = [(recipe, recipe.ingredients) for recipe in recipes]
+    timed("list scan", lambda q: [r for r, ings in ingredient_lists if any(ing in q for ing in ings)], queries)
+    timed("AIEngine.suggest", index_engine.suggest_recipes, queries)
+    timed("Vectorized.suggest", vector_engine.suggest_recipes, queries)
+    timed("AIEngine.rank top10", index_engine.rank_recipes, queries)
+    timed("Vectorized.rank top10", vector_engine.rank_recipes, queries)
+    timed("Vectorized.coverage", vector_engine.coverage_scores, queries)
+
+    batch_size = 64
+    batches = [queries[i : i + batch_size] for i in range(0, len(queries), batch_size)]
+    start = time.perf_counter()
+    for batch in batches:
+        vector_engine.match_counts_batch(batch)
+    elapsed = time.perf_counter() - start
+    print(f"{'Vectorized.batch(64)':<28} {elapsed / len(queries) * 1e3:>10.3f} ms/query {len(queries) / elapsed:>12.1f} queries/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Synthetic recipe catalogs with Zipfian ingredient frequencies.
+
+Usage: python benchmarks/synthetic_catalog.py 1000000 catalog.jsonl [--vocabulary 5000] [--seed 0]
+"""
+import argparse
+import bisect
+import itertools
+import json
+import random
+from typing import Iterator, List, Tuple
+
+DISH_WORDS = [
+    "biryani", "karahi", "pulao", "kebab", "korma", "tikka", "halwa", "chaat", "curry", "paratha",
+    "samosa", "daal", "kulfi", "lassi", "haleem", "nihari", "pakora", "raita", "salad", "soup",
+]
+STYLE_WORDS = [
+    "spicy", "smoky", "creamy", "crispy", "tangy", "lahori", "peshawari", "sindhi", "street", "royal",
+    "home", "quick", "festive", "masala", "garlic", "lemon", "mint", "butter", "green", "village",
+]
+STEPS = "1. Prepare the ingredients.\n2. Cook everything together with spices.\n3. Serve hot."
+
+
+class ZipfSampler:
+    # Draws item ranks with probability proportional to 1 / rank ** exponent
+    def __init__(self, size: int, exponent: float, rng: random.Random):
+        self.rng = rng
+        self.cumulative = list(itertools.accumulate(1.0 / rank**exponent for rank in range(1, size + 1)))
+
+    def sample(self) -> int:
+        return bisect.bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1])
+
+    def distinct(self, count: int) -> List[int]:
+        chosen = dict.fromkeys(self.sample() for _ in range(count))
+        while len(chosen) < count:
+            chosen.setdefault(self.sample())
+        return list(chosen)
+
+
+def ingredient_vocabulary(size: int) -> List[str]:
+    # Real ingredient words first so the most frequent ones look like staples
+    staples = ["salt", "onion", "spices", "oil", "garlic", "tomato", "ginger", "rice", "yogurt", "chicken"]
+    return (staples + [f"ingredient {rank:06d}" for rank in range(len(staples), size)])[:size]
+
+
+def generate_recipes(
+    size: int, vocabulary_size: int = 5000, exponent: float = 1.07, seed: int = 0,
+    min_ingredients: int = 3, max_ingredients: int = 10,
+) -> Iterator[Tuple[str, List[str], str]]:
+    # Yields (name, ingredient names, steps) without materializing the catalog
+    rng = random.Random(seed)
+    vocabulary = ingredient_vocabulary(vocabulary_size)
+    sampler = ZipfSampler(len(vocabulary), exponent, rng)
+    for recipe_id in range(size):
+        name = f"{rng.choice(STYLE_WORDS)} {rng.choice(DISH_WORDS)} {recipe_id}"
+        count = min(rng.randint(min_ingredients, max_ingredients), len(vocabulary))
+        yield name, [vocabulary[rank] for rank in sampler.distinct(count)], STEPS
+
+
+def generate_pantries(
+    count: int, vocabulary_size: int = 5000, exponent: float = 1.07, seed: int = 1, min_size: int = 2, max_size: int = 6
+) -> List[List[str]]:
+    rng = random.Random(seed)
+    vocabulary = ingredient_vocabulary(vocabulary_size)
+    sampler = ZipfSampler(len(vocabulary), exponent, rng)
+    return [[vocabulary[rank] for rank in sampler.distinct(rng.randint(min_size, max_size))] for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic recipe catalog as JSONL")
+    parser.add_argument("recipes", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--exponent", type=float, default=1.07)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    with open(args.output, "w", encoding="utf-8") as handle:
+        for name, ingredients, steps in generate_recipes(args.recipes, args.vocabulary, args.exponent, args.seed):
+            handle.write(json.dumps({"name": name, "ingredients": ingredients, "steps": steps}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
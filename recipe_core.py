@@ -0,0 +1,2558 @@
+"""Recipe engine core: ingredient and recipe models, indexes, ranking, catalog loading and snapshots.
+
+Has no UI dependency, so batch jobs, API workers and benchmarks import it directly.
+Heavy pieces (parquet support, process pools, secondary indexes) load on first use.
+"""
+import bisect
+import cProfile
+import csv
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import logging
+import math
+import mmap
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from array import array
+from cachetools import TTLCache
+from collections import Counter, defaultdict, deque
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+SCORING_METHODS = ("coverage", "jaccard", "tfidf")
+MAX_SUGGESTIONS = 10
+MAX_NAME_TYPOS = 2
+QUERY_CACHE_SIZE = 4096
+QUERY_CACHE_TTL = 600  # seconds
+# Full-text search over recipe steps (BM25 parameters)
+STEP_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+# "More like this": MinHash signatures of ingredient sets, split into LSH bands of MINHASH_ROWS values.
+# Recipes sharing a band become candidates; pairs with Jaccard similarity around 0.4 and up are usually found.
+MINHASH_BANDS = 16
+MINHASH_ROWS = 3
+SIMILAR_RECIPES = 5
+# Optional external catalog (.jsonl, .csv or .parquet); the built-in list is used when unset
+RECIPE_CATALOG_PATH = os.environ.get("RECIPE_CATALOG_PATH")
+# Optional JSON object of extra {"alias": "canonical ingredient"} entries
+INGREDIENT_ALIASES_PATH = os.environ.get("INGREDIENT_ALIASES_PATH")
+# Optional JSONL query log: every ingredient query is appended, and the most frequent pantries
+# in it are ranked ahead of time when the next engine starts
+QUERY_LOG_PATH = os.environ.get("RECIPE_QUERY_LOG")
+WARMUP_PANTRIES = int(os.environ.get("RECIPE_WARMUP_PANTRIES", "100"))
+WARMUP_TOP_K = 2 * MAX_SUGGESTIONS + 1  # Enough for the first two result pages
+# A cached engine swaps in a compacted catalog once this fraction of its entries are removed or replaced ones
+COMPACT_DEAD_RATIO = float(os.environ.get("RECIPE_COMPACT_DEAD_RATIO", "0.25"))
+
+# Opt-in query profiling: a sampled fraction of queries runs under cProfile and is dumped when slow
+PROFILE_SAMPLE_RATE = float(os.environ.get("RECIPE_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_THRESHOLD_MS = float(os.environ.get("RECIPE_PROFILE_THRESHOLD_MS", "50"))
+PROFILE_DIR = os.environ.get("RECIPE_PROFILE_DIR")  # Defaults to recipe-profiles in the temp directory
+
+logger = logging.getLogger(__name__)
+
+
+# Hot-path instrumentation
+class Metrics:
+    # Process-wide, thread-safe timers and counters, exportable as Prometheus text or JSON
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.timers: Dict[str, List[float]] = {}  # name -> [count, total seconds, max seconds]
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            timer = self.timers.setdefault(name, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    @contextmanager
+    def timer(self, name: str, profile: bool = False):
+        profiler = None
+        if profile and PROFILE_SAMPLE_RATE > 0 and not getattr(self._local, "profiling", False):
+            if random.random() < PROFILE_SAMPLE_RATE:
+                profiler = cProfile.Profile()
+                self._local.profiling = True
+                profiler.enable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe(name, elapsed)
+            if profiler is not None:
+                profiler.disable()
+                self._local.profiling = False
+                if elapsed * 1000 >= PROFILE_THRESHOLD_MS:
+                    self._dump_profile(profiler, name, elapsed)
+
+    def _dump_profile(self, profiler: cProfile.Profile, name: str, elapsed: float):
+        import tempfile
+
+        directory = PROFILE_DIR or os.path.join(tempfile.gettempdir(), "recipe-profiles")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}-{time.time_ns()}-{elapsed * 1000:.0f}ms.prof")
+        profiler.dump_stats(path)
+        self.increment("slow_query_profiles")
+        logger.warning("Slow %s took %.1f ms, profile written to %s", name, elapsed * 1000, path)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "timers": {
+                    name: {"count": count, "total_seconds": total, "max_seconds": longest}
+                    for name, (count, total, longest) in self.timers.items()
+                },
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        data = self.snapshot()
+        lines = []
+        for name, value in sorted(data["counters"].items()):
+            lines += [f"# TYPE recipe_{name}_total counter", f"recipe_{name}_total {value:g}"]
+        for name, timer in sorted(data["timers"].items()):
+            lines += [
+                f"# TYPE recipe_{name}_seconds summary",
+                f"recipe_{name}_seconds_count {timer['count']}",
+                f"recipe_{name}_seconds_sum {timer['total_seconds']:.9f}",
+                f"# TYPE recipe_{name}_seconds_max gauge",
+                f"recipe_{name}_seconds_max {timer['max_seconds']:.9f}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+
+
+metrics = Metrics()
+
+
+def timed(name: str, profile: bool = False):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with metrics.timer(name, profile=profile):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# Ingredient normalization: surface forms ("Roma tomatoes", "dahi", "onions") map to one canonical name
+INGREDIENT_ALIASES = {
+    "cilantro": "coriander", "coriander leaf": "coriander", "dhania": "coriander",
+    "roma tomato": "tomato", "cherry tomato": "tomato", "tamatar": "tomato",
+    "curd": "yogurt", "yoghurt": "yogurt", "dahi": "yogurt",
+    "aloo": "potato", "pyaz": "onion", "red onion": "onion", "lehsun": "garlic", "adrak": "ginger",
+    "capsicum": "bell pepper", "shimla mirch": "bell pepper",
+    "green chilli": "green chili", "hari mirch": "green chili",
+    "brinjal": "eggplant", "aubergine": "eggplant", "baingan": "eggplant",
+    "shrimp": "prawn", "jhinga": "prawn",
+    "garbanzo": "chickpea", "garbanzo bean": "chickpea", "chole": "chickpea", "chana": "chickpea",
+    "chana dal": "chana daal", "daal": "dal", "lentil": "dal",
+    "methi": "fenugreek leaf", "palak": "spinach", "gajar": "carrot",
+    "clarified butter": "ghee", "cottage cheese": "paneer",
+    "maida": "flour", "atta": "flour", "all purpose flour": "flour", "wheat flour": "flour",
+    "cooking oil": "oil", "vegetable oil": "oil", "sea salt": "salt",
+    "mince": "minced meat", "keema": "minced meat", "chicken breast": "chicken",
+    "doodh": "milk", "chawal": "rice", "basmati rice": "rice",
+}
+INGREDIENT_DESCRIPTORS = {"fresh", "chopped", "diced", "sliced", "large", "small", "ripe", "dried", "frozen", "organic", "raw"}
+IRREGULAR_PLURALS = {"leaves": "leaf", "chilies": "chili", "chillies": "chili", "loaves": "loaf", "halves": "half"}
+INVARIANT_WORDS = {"molasses", "hummus", "couscous", "asparagus", "swiss", "grits", "chutney", "masala"}
+# Singulars ending in "ie" or "che": "cookies" and "quiches" keep their e, unlike "berries" or "peaches"
+IE_SINGULARS = {"cookie", "pie", "brownie", "smoothie", "veggie", "hoagie", "calorie", "lassie", "pierogie"}
+CHE_SINGULARS = {"quiche", "brioche", "ganache", "panache", "cloche", "fraiche"}
+
+
+def _singular(word: str) -> str:
+    if word in IRREGULAR_PLURALS:
+        return IRREGULAR_PLURALS[word]
+    if word in INVARIANT_WORDS or len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-1] if word[:-1] in IE_SINGULARS else word[:-3] + "y"
+    if word.endswith("ches") and word[:-1] in CHE_SINGULARS:
+        return word[:-1]
+    if word.endswith("oes") or word.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def _compile_aliases(aliases: Dict[str, str]) -> Dict[str, str]:
+    # Precompiled lookup: every alias, plus its singular form, points straight at its canonical name
+    table = {}
+    for alias, canonical in aliases.items():
+        table[alias] = canonical
+        words = alias.split()
+        table.setdefault(" ".join(words[:-1] + [_singular(words[-1])]), canonical)
+    return table
+
+
+def _load_aliases(path: Optional[str]) -> Dict[str, str]:
+    aliases = dict(INGREDIENT_ALIASES)
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            aliases.update({alias.strip().lower(): canonical.strip().lower() for alias, canonical in json.load(handle).items()})
+    return aliases
+
+
+ALIAS_TABLE = _compile_aliases(_load_aliases(INGREDIENT_ALIASES_PATH))
+
+
+@functools.lru_cache(maxsize=65536)
+def canonical_ingredient_name(name: str) -> str:
+    words = re.sub(r"[^\w\s]", " ", name.lower()).split()
+    if not words:
+        return ""
+    phrase = " ".join(words)
+    if phrase in ALIAS_TABLE:
+        return ALIAS_TABLE[phrase]
+    while len(words) > 1 and words[0] in INGREDIENT_DESCRIPTORS:
+        words = words[1:]
+    words[-1] = _singular(words[-1])
+    phrase = " ".join(words)
+    return ALIAS_TABLE.get(phrase, phrase)
+
+
+# Define OOP Classes
+class Ingredient:
+    # Interned: Ingredient("Onions") always returns the single canonical object for "onion",
+    # whose id indexes the process-wide vocabulary. User input goes through Ingredient.query instead,
+    # so arbitrary query strings never grow the vocabulary.
+    __slots__ = ("name", "id")
+    _vocabulary: Dict[str, "Ingredient"] = {}
+    _by_id: List["Ingredient"] = []
+    _intern_lock = threading.Lock()
+
+    def __new__(cls, name: str):
+        name = canonical_ingredient_name(name)  # Normalize ingredient name
+        ingredient = cls._vocabulary.get(name)
+        if ingredient is None:
+            with cls._intern_lock:  # Concurrent sessions must not mint two ids for one name
+                ingredient = cls._vocabulary.get(name)
+                if ingredient is None:
+                    ingredient = cls._make(name, len(cls._by_id))
+                    cls._by_id.append(ingredient)
+                    cls._vocabulary[name] = ingredient
+        return ingredient
+
+    @classmethod
+    def _make(cls, name: str, ingredient_id: int) -> "Ingredient":
+        ingredient = super().__new__(cls)
+        ingredient.name = name
+        ingredient.id = ingredient_id
+        return ingredient
+
+    @classmethod
+    def query(cls, name: str) -> "Ingredient":
+        # Canonical ingredient for a query term: the interned object if the name is known, otherwise
+        # a transient one (id -1) that queries can match by name but recipes cannot be built from
+        name = canonical_ingredient_name(name)
+        ingredient = cls._vocabulary.get(name)
+        return ingredient if ingredient is not None else cls._make(name, -1)
+
+    @classmethod
+    def from_id(cls, ingredient_id: int) -> "Ingredient":
+        return cls._by_id[ingredient_id]
+
+    def __reduce__(self):
+        # Ids are process-local, so re-intern by name when unpickled
+        return (Ingredient if self.id >= 0 else Ingredient.query), (self.name,)
+
+    def __repr__(self):
+        return self.name
+
+    def __eq__(self, other):
+        if isinstance(other, Ingredient):
+            return self.name == other.name
+        return False
+
+    def __hash__(self):
+        return hash(self.name)
+
+
+class Recipe:
+    # Ingredients are stored as a compact array of vocabulary ids. Ingredients given as text are
+    # canonicalized for matching, and the text as written is kept in labels for display.
+    __slots__ = ("name", "ingredient_ids", "steps", "labels")
+
+    def __init__(self, name: str, ingredients: Iterable[Union[Ingredient, str]], steps: str):
+        self.name = name.strip().lower()
+        ingredients = list(ingredients)
+        labels = [" ".join(ingredient.split()) if isinstance(ingredient, str) else None for ingredient in ingredients]
+        ingredients = [Ingredient(ingredient) if isinstance(ingredient, str) else ingredient for ingredient in ingredients]
+        ingredient_ids = [ingredient.id for ingredient in ingredients]
+        if min(ingredient_ids, default=0) < 0:
+            unknown = ", ".join(ingredient.name for ingredient in ingredients if ingredient.id < 0)
+            raise ValueError(f"recipe {self.name!r} uses query-only ingredients: {unknown}; build them with Ingredient()")
+        self.ingredient_ids = array("I", ingredient_ids)
+        self.steps = steps
+        labels = [label or ingredient.name for label, ingredient in zip(labels, ingredients)]
+        # Only kept when some label differs from its canonical name; labels repeat across recipes, so they are interned
+        same = all(label == ingredient.name for label, ingredient in zip(labels, ingredients))
+        self.labels = None if same else tuple(map(sys.intern, labels))
+
+    @property
+    def ingredients(self) -> List[Ingredient]:
+        return [Ingredient.from_id(ingredient_id) for ingredient_id in self.ingredient_ids]
+
+    @property
+    def ingredient_labels(self) -> List[str]:
+        # Ingredients as the catalog wrote them ("lentils", "cilantro"), for display
+        return list(self.labels) if self.labels is not None else [ingredient.name for ingredient in self.ingredients]
+
+    def __reduce__(self):
+        return _restore_recipe, (self.name, [ingredient.name for ingredient in self.ingredients], self.steps, self.ingredient_labels)
+
+    def matches_ingredients(self, available_ingredients: List[Ingredient]) -> bool:
+        available = set(available_ingredients)
+        return any(ingredient in available for ingredient in self.ingredients)
+
+    def __repr__(self):
+        return f"{self.name}: Ingredients: {[ing.name for ing in self.ingredients]}, Steps: {self.steps}"
+
+
+def _restore_recipe(name: str, ingredient_names: List[str], steps: str, labels: List[str]) -> Recipe:
+    # Unpickling re-interns the canonical names (ids are process-local) and keeps the display labels as they were
+    recipe = Recipe(name, [Ingredient(ingredient_name) for ingredient_name in ingredient_names], steps)
+    if labels != ingredient_names:
+        recipe.labels = tuple(map(sys.intern, labels))
+    return recipe
+
+
+class RecipeNameIndex:
+    # Exact (hash), prefix (sorted names + bisect) and typo-tolerant (trigram) lookups over recipe names.
+    # Names map to recipe ids; later recipes sharing a name wait in duplicate_ids until the first is removed.
+    def __init__(self, recipes: List[Recipe]):
+        self.by_name: Dict[str, int] = {}
+        self.duplicate_ids: Dict[str, List[int]] = {}
+        for recipe_id, recipe in enumerate(recipes):
+            if self.by_name.setdefault(recipe.name, recipe_id) != recipe_id:
+                self.duplicate_ids.setdefault(recipe.name, []).append(recipe_id)
+        self.sorted_names = sorted(self.by_name)
+        self.trigram_index = defaultdict(list)
+        self.names_by_length = defaultdict(list)
+        for name in self.sorted_names:
+            for gram in set(self._trigrams(name)):
+                self.trigram_index[gram].append(name)
+            self.names_by_length[len(name)].append(name)
+
+    @staticmethod
+    def _trigrams(name: str) -> List[str]:
+        padded = f"  {name} "
+        return [padded[i : i + 3] for i in range(len(padded) - 2)]
+
+    @staticmethod
+    def _bounded_edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+        # Levenshtein distance, abandoned as soon as every cell in a row exceeds max_distance
+        if abs(len(a) - len(b)) > max_distance:
+            return None
+        previous = list(range(len(b) + 1))
+        for i, char_a in enumerate(a, 1):
+            current = [i]
+            for j, char_b in enumerate(b, 1):
+                current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+            if min(current) > max_distance:
+                return None
+            previous = current
+        return previous[-1] if previous[-1] <= max_distance else None
+
+    def get(self, name: str) -> Optional[int]:
+        return self.by_name.get(name)
+
+    # Incremental updates replace containers instead of mutating them, so a concurrent
+    # reader always sees either the old or the new version of each entry
+    def add(self, name: str, recipe_id: int):
+        if name in self.by_name:
+            self.duplicate_ids[name] = self.duplicate_ids.get(name, []) + [recipe_id]
+            return
+        position = bisect.bisect_left(self.sorted_names, name)
+        for gram in set(self._trigrams(name)):
+            self.trigram_index[gram] = self.trigram_index.get(gram, []) + [name]
+        self.names_by_length[len(name)] = self.names_by_length.get(len(name), []) + [name]
+        self.by_name[name] = recipe_id
+        self.sorted_names = self.sorted_names[:position] + [name] + self.sorted_names[position:]
+
+    def remove(self, name: str, recipe_id: int):
+        duplicates = self.duplicate_ids.get(name, [])
+        if self.by_name.get(name) != recipe_id:
+            self.duplicate_ids[name] = [other for other in duplicates if other != recipe_id]
+        elif duplicates:
+            self.by_name[name] = duplicates[0]
+            self.duplicate_ids[name] = duplicates[1:]
+        else:
+            position = bisect.bisect_left(self.sorted_names, name)
+            self.sorted_names = self.sorted_names[:position] + self.sorted_names[position + 1 :]
+            del self.by_name[name]
+            for gram in set(self._trigrams(name)):
+                self.trigram_index[gram] = [other for other in self.trigram_index[gram] if other != name]
+            self.names_by_length[len(name)] = [other for other in self.names_by_length[len(name)] if other != name]
+        if not self.duplicate_ids.get(name, True):
+            del self.duplicate_ids[name]
+
+    def replace(self, name: str, old_id: int, new_id: int):
+        # remove(name, old_id) then add(name, new_id), except that the name stays resolvable throughout
+        duplicates = self.duplicate_ids.get(name, [])
+        if self.by_name.get(name) != old_id:
+            self.duplicate_ids[name] = [other for other in duplicates if other != old_id] + [new_id]
+        elif duplicates:
+            self.duplicate_ids[name] = duplicates + [new_id]
+            self.by_name[name] = duplicates[0]
+            self.duplicate_ids[name] = duplicates[1:] + [new_id]
+        else:
+            self.by_name[name] = new_id
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        start = bisect.bisect_left(self.sorted_names, prefix)
+        matches = []
+        for name in self.sorted_names[start : start + limit]:
+            if not name.startswith(prefix):
+                break
+            matches.append(name)
+        return matches
+
+    def _fuzzy_candidates(self, name: str, max_distance: int) -> List[str]:
+        grams = self._trigrams(name)
+        # q-gram lemma: each edit destroys at most 3 trigrams of the query
+        min_shared = len(grams) - 3 * max_distance
+        if min_shared <= 0:
+            return [
+                candidate
+                for length in range(len(name) - max_distance, len(name) + max_distance + 1)
+                for candidate in self.names_by_length.get(length, ())
+            ]
+        shared = defaultdict(int)
+        for gram in grams:
+            for candidate in self.trigram_index.get(gram, ()):
+                shared[candidate] += 1
+        return [candidate for candidate, count in shared.items() if count >= min_shared]
+
+    def fuzzy(self, name: str, max_distance: int = 2, limit: int = 5) -> List[Tuple[str, int]]:
+        matches = []
+        for candidate in self._fuzzy_candidates(name, max_distance):
+            distance = self._bounded_edit_distance(name, candidate, max_distance)
+            if distance is not None:
+                matches.append((distance, candidate))
+        return [(candidate, distance) for distance, candidate in heapq.nsmallest(limit, matches)]
+
+
+class _TermPostings:
+    # Sorted recipe ids containing one step term; token positions of the i-th recipe are
+    # positions[offsets[i] - offsets[0] : offsets[i + 1] - offsets[0]]
+    __slots__ = ("ids", "offsets", "positions")
+
+    def __init__(self, ids, offsets, positions):
+        self.ids = ids
+        self.offsets = offsets
+        self.positions = positions
+
+    def find(self, recipe_id: int) -> int:
+        position = bisect.bisect_left(self.ids, recipe_id)
+        return position if position < len(self.ids) and self.ids[position] == recipe_id else -1
+
+    def term_frequency(self, index: int) -> int:
+        return self.offsets[index + 1] - self.offsets[index]
+
+    def positions_at(self, index: int):
+        base = self.offsets[0]
+        return self.positions[self.offsets[index] - base : self.offsets[index + 1] - base]
+
+    def with_recipe(self, recipe_id: int, positions: List[int]) -> "_TermPostings":
+        # Copy-on-write: returns new postings and leaves this object untouched for concurrent readers.
+        # Ids only grow, so appending keeps the list sorted.
+        return _TermPostings(
+            self.ids + array("I", [recipe_id]),
+            self.offsets + array("Q", [self.offsets[-1] + len(positions)]),
+            self.positions + array("I", positions),
+        )
+
+
+_step_term = functools.lru_cache(maxsize=65536)(_singular)
+
+
+class StepTextIndex:
+    # Positional inverted index over recipe steps: BM25-ranked terms, and "quoted phrases" that must match.
+    # Removed recipes stay in the postings as tombstones, masked out by live, until the catalog is compacted.
+    def __init__(self):
+        self.postings: Dict[str, _TermPostings] = {}
+        self.document_lengths = array("I")  # Tokens per recipe id; kept for removed ids too
+        self.live = bytearray()  # 1 per recipe id still in the catalog
+        self.dead_counts: Dict[str, int] = {}  # Tombstoned ids per term, so document frequencies stay exact
+        self.total_length = 0
+        self.document_count = 0
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return [_step_term(word) for word in STEP_TOKEN_PATTERN.findall(text.lower())]
+
+    @classmethod
+    def _term_positions(cls, text: str) -> Tuple[Dict[str, List[int]], int]:
+        tokens = cls.tokenize(text)
+        positions = defaultdict(list)
+        for position, term in enumerate(tokens):
+            positions[term].append(position)
+        return positions, len(tokens)
+
+    def append(self, recipe_id: int, text: str):
+        # Build-time path: extends posting lists in place before any reader can see the index
+        term_positions, length = self._term_positions(text)
+        for term, positions in term_positions.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = _TermPostings(array("I"), array("Q", [0]), array("I"))
+            postings.ids.append(recipe_id)
+            postings.positions.extend(positions)
+            postings.offsets.append(len(postings.positions))
+        self.document_lengths.append(length)
+        self.live.append(1)
+        self.total_length += length
+        self.document_count += 1
+
+    def apply(self, removed: List[Tuple[int, str]], added: List[Tuple[int, str]]):
+        # Incremental path: removals only flip a live flag, additions get new postings for their terms.
+        # Every field is rebuilt copy-on-write and postings are published last, so a reader that
+        # takes postings first never sees an id the other fields do not cover yet.
+        postings = dict(self.postings)
+        live = bytearray(self.live)
+        dead_counts = dict(self.dead_counts)
+        document_lengths = array("I", self.document_lengths)
+        total_length, document_count = self.total_length, self.document_count
+        for recipe_id, text in removed:
+            if not live[recipe_id]:
+                continue
+            for term in self._term_positions(text)[0]:
+                dead_counts[term] = dead_counts.get(term, 0) + 1
+            live[recipe_id] = 0
+            total_length -= document_lengths[recipe_id]
+            document_count -= 1
+        for recipe_id, text in added:
+            term_positions, length = self._term_positions(text)
+            for term, positions in term_positions.items():
+                current = postings.get(term)
+                if current is None:
+                    postings[term] = _TermPostings(
+                        array("I", [recipe_id]), array("Q", [0, len(positions)]), array("I", positions)
+                    )
+                else:
+                    postings[term] = current.with_recipe(recipe_id, positions)
+            document_lengths.append(length)
+            live.append(1)
+            total_length += length
+            document_count += 1
+        self.document_lengths, self.live, self.dead_counts = document_lengths, live, dead_counts
+        self.total_length, self.document_count = total_length, document_count
+        self.postings = postings
+
+    @staticmethod
+    def _phrase_ids(np, postings: Dict[str, _TermPostings], terms: List[str], allowed):
+        # Sorted ids of allowed recipes with the terms at consecutive positions. Each (recipe id, start
+        # position) pair is packed into one int64 key, and keys are intersected term by term, rarest first.
+        lists = [(offset, postings.get(term)) for offset, term in enumerate(terms)]
+        if any(term_postings is None for _, term_postings in lists):
+            return np.zeros(0, dtype=np.int64)
+        keys = None
+        for offset, term_postings in sorted(lists, key=lambda entry: len(entry[1].ids)):
+            ids = np.frombuffer(term_postings.ids, dtype=np.uint32)
+            offsets = np.frombuffer(term_postings.offsets, dtype=np.uint64)
+            owners = np.repeat(ids, np.diff(offsets).astype(np.int64)).astype(np.int64)
+            starts = np.frombuffer(term_postings.positions, dtype=np.uint32).astype(np.int64) - offset
+            keep = allowed[owners] & (starts >= 0)
+            term_keys = (owners[keep] << 32) | starts[keep]  # Sorted: ids ascend, and positions within an id
+            if keys is None:
+                keys = term_keys
+            else:
+                found = np.minimum(np.searchsorted(term_keys, keys), max(len(term_keys) - 1, 0))
+                keys = keys[term_keys[found] == keys] if len(term_keys) else term_keys
+            if not len(keys):
+                break
+            allowed = np.zeros_like(allowed)
+            allowed[keys >> 32] = True
+        return np.unique(keys >> 32)
+
+    def search(
+        self, query: str, top_k: int = MAX_SUGGESTIONS, candidates: Optional[set] = None, accept=None
+    ) -> List[Tuple[int, float]]:
+        # Returns (recipe id, BM25 score) best-first. Loose terms are OR-ed; candidates (a set of ids) and
+        # accept (maps a numpy id array to a keep mask) optionally restrict the result. Each term is scored
+        # over its whole posting list with numpy, and only the top_k best are sorted.
+        import numpy as np  # Only needed for step search
+
+        postings = self.postings  # One consistent version for the whole query; the fields below are never older
+        lengths = np.frombuffer(self.document_lengths, dtype=np.uint32)
+        allowed = np.frombuffer(self.live, dtype=np.bool_)[: len(lengths)].copy()
+        count = max(self.document_count, 1)
+        length_scale = BM25_K1 * BM25_B / (self.total_length / count or 1.0)
+        dead_counts = self.dead_counts
+        if top_k <= 0:
+            return []
+
+        phrases = [terms for terms in map(self.tokenize, re.findall(r'"([^"]*)"', query)) if terms]
+        terms = dict.fromkeys(self.tokenize(re.sub(r'"[^"]*"', " ", query)))
+        terms.update(dict.fromkeys(term for phrase in phrases for term in phrase))
+        restricted = candidates is not None or bool(phrases)
+        if candidates is not None:
+            mask = np.zeros_like(allowed)
+            mask[np.fromiter(candidates, dtype=np.int64, count=len(candidates))] = True
+            allowed &= mask
+        for phrase in phrases:
+            matched = self._phrase_ids(np, postings, phrase, allowed)
+            allowed = np.zeros_like(allowed)
+            allowed[matched] = True
+        if restricted and accept is not None:
+            ids = np.flatnonzero(allowed)
+            allowed[ids[~accept(ids)]] = False
+            accept = None
+
+        term_postings = [(term, postings.get(term)) for term in terms]
+        term_postings = [(term, current) for term, current in term_postings if current is not None]
+        # BM25 term weight is idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / average)), with constants hoisted
+        length_base = BM25_K1 * (1 - BM25_B)
+        allowed_ids = np.flatnonzero(allowed) if restricted else None
+        # Few candidates left: look each one up in the term's postings instead of walking the whole list
+        probe = restricted and len(allowed_ids) * len(term_postings) < sum(len(p.ids) for _, p in term_postings)
+        scores = np.zeros(len(lengths))
+        scanned = 0
+        for term, current in term_postings:
+            document_frequency = len(current.ids) - dead_counts.get(term, 0)
+            if document_frequency <= 0:
+                continue
+            weight = (BM25_K1 + 1) * math.log(1 + (count - document_frequency + 0.5) / (document_frequency + 0.5))
+            ids = np.frombuffer(current.ids, dtype=np.uint32)
+            offsets = np.frombuffer(current.offsets, dtype=np.uint64)
+            if probe:
+                found = np.searchsorted(ids, allowed_ids)
+                hit = found < len(ids)
+                found, selected = found[hit], allowed_ids[hit]
+                hit = ids[found] == selected
+                indexes, selected = found[hit], selected[hit]
+            else:
+                scanned += len(ids)
+                indexes = np.flatnonzero(allowed[ids])
+                selected = ids[indexes]
+            frequency = (offsets[indexes + 1] - offsets[indexes]).astype(np.float64)
+            scores[selected] += weight * frequency / (frequency + length_base + length_scale * lengths[selected])
+        metrics.increment("step_postings_scanned", scanned)
+
+        matched = np.flatnonzero(scores)
+        if accept is not None:
+            matched = matched[accept(matched)]
+        if len(matched) > top_k:
+            # Everything scoring below the top_k-th best is dropped before sorting; ties at the cut are kept
+            cut = np.partition(scores[matched], len(matched) - top_k)[len(matched) - top_k]
+            matched = matched[scores[matched] >= cut]
+        ordered = matched[np.lexsort((matched, -scores[matched]))][:top_k]  # Best first, lower ids win ties
+        return list(zip(ordered.tolist(), scores[ordered].tolist()))
+
+
+_MINHASH_PRIME = (1 << 61) - 1
+_minhash_random = random.Random(0x5EED)  # Fixed seed: signatures must agree across processes and snapshots
+_MINHASH_PARAMETERS = [
+    (_minhash_random.randrange(1, _MINHASH_PRIME), _minhash_random.randrange(_MINHASH_PRIME))
+    for _ in range(MINHASH_BANDS * MINHASH_ROWS)
+]
+
+
+@functools.lru_cache(maxsize=65536)
+def _minhash_values(name: str) -> Tuple[int, ...]:
+    # One 32-bit value per hash function; a recipe signature is the element-wise minimum over its ingredients
+    base = int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+    return tuple((a * base + b) % _MINHASH_PRIME & 0xFFFFFFFF for a, b in _MINHASH_PARAMETERS)
+
+
+class RecipeSimilarityIndex:
+    # LSH over MinHash signatures: bucket key -> ids of recipes whose signature has that band.
+    # Lookups only touch the query recipe's buckets, so cost tracks the number of near neighbours, not the catalog.
+    def __init__(self):
+        self.signatures = array("I")  # MINHASH_BANDS * MINHASH_ROWS values per recipe id
+        self.buckets: Dict[int, List[int]] = {}
+
+    @staticmethod
+    def signature(names: Iterable[str]) -> array:
+        values = [_minhash_values(name) for name in names]
+        return array("I", map(min, zip(*values)) if values else [0xFFFFFFFF] * MINHASH_BANDS * MINHASH_ROWS)
+
+    @staticmethod
+    def _band_keys(signature) -> List[int]:
+        raw = array("I", signature).tobytes()
+        width = 4 * MINHASH_ROWS
+        return [band << 32 | zlib.crc32(raw[band * width : (band + 1) * width]) for band in range(MINHASH_BANDS)]
+
+    def signature_of(self, recipe_id: int):
+        size = MINHASH_BANDS * MINHASH_ROWS
+        return self.signatures[recipe_id * size : (recipe_id + 1) * size]
+
+    def append(self, recipe_id: int, names: Iterable[str]):
+        # Build-time path: buckets grow in place before any reader can see the index
+        signature = self.signature(names)
+        self.signatures.extend(signature)
+        if signature[0] != 0xFFFFFFFF:  # Recipes without ingredients are never similar to anything
+            for key in self._band_keys(signature):
+                self.buckets.setdefault(key, []).append(recipe_id)
+
+    # Incremental path: each touched bucket is replaced by a new list, so readers see the old or new one
+    def add(self, recipe_id: int, names: Iterable[str]):
+        signature = self.signature(names)
+        self.signatures.extend(signature)
+        if signature[0] != 0xFFFFFFFF:
+            for key in self._band_keys(signature):
+                self.buckets[key] = self.buckets.get(key, []) + [recipe_id]
+
+    def remove(self, recipe_id: int):
+        for key in self._band_keys(self.signature_of(recipe_id)):
+            if key in self.buckets:
+                remaining = [other for other in self.buckets[key] if other != recipe_id]
+                if remaining:
+                    self.buckets[key] = remaining
+                else:
+                    del self.buckets[key]
+
+    def candidates(self, recipe_id: int) -> set:
+        found = set()
+        for key in self._band_keys(self.signature_of(recipe_id)):
+            found.update(self.buckets.get(key, ()))
+        found.discard(recipe_id)
+        return found
+
+
+class QueryConstraints:
+    # Optional limits on an ingredient query: at most max_missing recipe ingredients absent from the
+    # pantry, every required ingredient present and no excluded one (allergens)
+    __slots__ = ("max_missing", "required", "excluded")
+
+    def __init__(
+        self, max_missing: Optional[int] = None, required: Iterable[Ingredient] = (), excluded: Iterable[Ingredient] = ()
+    ):
+        if max_missing is not None and max_missing < 0:
+            raise ValueError("max_missing must be >= 0")
+        self.max_missing = max_missing
+        self.required = frozenset(ingredient.name for ingredient in required)
+        self.excluded = frozenset(ingredient.name for ingredient in excluded)
+        conflicting = self.required & self.excluded
+        if conflicting:
+            raise ValueError(f"Ingredients both required and excluded: {', '.join(sorted(conflicting))}")
+
+    def _key(self) -> tuple:
+        return self.max_missing, self.required, self.excluded
+
+    def __bool__(self):
+        return self.max_missing is not None or bool(self.required or self.excluded)
+
+    def __eq__(self, other):
+        return isinstance(other, QueryConstraints) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __reduce__(self):
+        return _constraints_from_names, (self.max_missing, tuple(self.required), tuple(self.excluded))
+
+    def __repr__(self):
+        return (
+            f"QueryConstraints(max_missing={self.max_missing}, required={sorted(self.required)}, "
+            f"excluded={sorted(self.excluded)})"
+        )
+
+
+def _constraints_from_names(max_missing: Optional[int], required: Tuple[str, ...], excluded: Tuple[str, ...]):
+    return QueryConstraints(
+        max_missing, [Ingredient.query(name) for name in required], [Ingredient.query(name) for name in excluded]
+    )
+
+
+class AIEngine:
+    @timed("engine_build")
+    def __init__(self, recipes: Iterable[Recipe]):
+        # Accepts any iterable, so streaming loaders are indexed in a single pass
+        self.recipes: List[Recipe] = []
+        # Inverted index: ingredient name -> ascending ids (positions in self.recipes)
+        self.ingredient_index: Dict[str, List[int]] = defaultdict(list)
+        # Per-recipe distinct ingredient counts and IDF weights used for ranking
+        self._ingredient_counts: List[int] = []
+        for recipe in recipes:
+            self._index_recipe(recipe)
+        self.ingredient_index = dict(self.ingredient_index)
+        self._idf = {
+            name: self._idf_value(len(postings), len(self.recipes)) for name, postings in self.ingredient_index.items()
+        }
+        self._recipe_weights = [
+            sum(self._idf[name] for name in {ing.name for ing in recipe.ingredients}) for recipe in self.recipes
+        ]
+        # Name, step text and similarity indexes are built on first use, so workers that only
+        # rank by ingredients never pay for them
+        self._name_index: Optional[RecipeNameIndex] = None
+        self._step_index: Optional[StepTextIndex] = None
+        self._similarity_index: Optional[RecipeSimilarityIndex] = None
+        # Bumped whenever the catalog changes so result caches can invalidate themselves
+        self.catalog_version = 0
+        # Incremental updates: ids are never reused, removed recipes stay in self.recipes as dead
+        # entries (so readers holding an older index still resolve them) until compact()
+        self._live = bytearray(b"\x01") * len(self.recipes)
+        self._dead_recipes = 0
+        self._weights_stale = False  # Set by updates: IDF depends on the catalog size, so every weight drifts
+        self._write_lock = threading.Lock()
+
+    def _index_recipe(self, recipe: Recipe):
+        recipe_id = len(self.recipes)
+        self.recipes.append(recipe)
+        names = dict.fromkeys(ing.name for ing in recipe.ingredients)
+        for name in names:
+            self.ingredient_index[name].append(recipe_id)
+        self._ingredient_counts.append(len(names))
+
+    @staticmethod
+    def _idf_value(document_frequency: int, total: int) -> float:
+        # Smoothed IDF: staples such as salt or onion get weights close to 1
+        return math.log((1 + total) / (1 + document_frequency)) + 1.0
+
+    def _build_index(self, attribute: str, build):
+        # Builds under the write lock so no update is missed, then drops recipes removed before the first use
+        with self._write_lock:
+            index = getattr(self, attribute)
+            if index is None:
+                with metrics.timer(f"index_build_{attribute.lstrip('_')}"):
+                    index = build()
+                setattr(self, attribute, index)
+        return index
+
+    def warm_indexes(self):
+        # Builds the lazy indexes now rather than on the first request that needs one
+        with metrics.timer("index_warmup"):
+            for name in ("name_index", "step_index", "similarity_index"):
+                getattr(self, name)
+
+    @property
+    def name_index(self) -> RecipeNameIndex:
+        if self._name_index is not None:
+            return self._name_index
+
+        def build():
+            index = RecipeNameIndex(self.recipes)
+            for recipe_id in self._dead_ids():
+                index.remove(self.recipes[recipe_id].name, recipe_id)
+            return index
+
+        return self._build_index("_name_index", build)
+
+    @property
+    def step_index(self) -> StepTextIndex:
+        if self._step_index is not None:
+            return self._step_index
+
+        def build():
+            index = StepTextIndex()
+            for recipe_id, recipe in enumerate(self.recipes):
+                index.append(recipe_id, recipe.steps)
+            index.apply([(recipe_id, self.recipes[recipe_id].steps) for recipe_id in self._dead_ids()], [])
+            return index
+
+        return self._build_index("_step_index", build)
+
+    @property
+    def similarity_index(self) -> RecipeSimilarityIndex:
+        if self._similarity_index is not None:
+            return self._similarity_index
+
+        def build():
+            index = RecipeSimilarityIndex()
+            for recipe_id, recipe in enumerate(self.recipes):
+                index.append(recipe_id, dict.fromkeys(ing.name for ing in recipe.ingredients))
+            for recipe_id in self._dead_ids():
+                index.remove(recipe_id)
+            return index
+
+        return self._build_index("_similarity_index", build)
+
+    def _dead_ids(self) -> List[int]:
+        live = getattr(self, "_live", None)
+        return [] if live is None else [recipe_id for recipe_id, alive in enumerate(live) if not alive]
+
+    @property
+    def recipe_count(self) -> int:
+        return len(self.recipes) - getattr(self, "_dead_recipes", 0)
+
+    def live_recipes(self) -> Iterator[Recipe]:
+        live = getattr(self, "_live", None)
+        for recipe_id, recipe in enumerate(self.recipes):
+            if live is None or live[recipe_id]:
+                yield recipe
+
+    def _apply_changes(self, remove_names: List[str], add_recipes: List[Recipe]) -> List[int]:
+        # Builds the next ingredient index copy-on-write (touched posting lists are new objects,
+        # everything else is shared) and publishes it with one attribute assignment, so queries
+        # that already hold the previous index finish against a consistent catalog
+        if not isinstance(self.recipes, list):
+            raise RuntimeError("Snapshot-backed engines are read-only; compile a new snapshot instead")
+        if remove_names:
+            self.name_index  # Built outside the write lock, which building it takes
+        with self._write_lock:
+            # Names resolve under the lock, so concurrent writers never both remove the same id
+            remove_ids = [
+                recipe_id for recipe_id in dict.fromkeys(map(self._live_id, remove_names)) if self._live[recipe_id]
+            ]
+            index = dict(self.ingredient_index)
+            touched = set()
+            for recipe_id in remove_ids:
+                recipe = self.recipes[recipe_id]
+                for name in dict.fromkeys(ing.name for ing in recipe.ingredients):
+                    postings = index[name]
+                    position = bisect.bisect_left(postings, recipe_id)
+                    if position == len(postings) or postings[position] != recipe_id:
+                        continue
+                    remaining = postings[:position] + postings[position + 1 :]
+                    if remaining:
+                        index[name] = remaining
+                    else:
+                        del index[name]
+                    touched.add(name)
+
+            added_ids = []
+            for recipe in add_recipes:
+                recipe_id = len(self.recipes)
+                names = list(dict.fromkeys(ing.name for ing in recipe.ingredients))
+                # Per-recipe arrays grow before the new index is published, so no reader sees a dangling id
+                self.recipes.append(recipe)
+                self._ingredient_counts.append(len(names))
+                self._live.append(1)
+                for name in names:
+                    index[name] = index.get(name, []) + [recipe_id]  # New ids are the largest, order is kept
+                    touched.add(name)
+                added_ids.append(recipe_id)
+
+            # Only touched ingredients get fresh IDF values here; _refresh_weights() redoes all of them
+            # before the next tfidf ranking
+            idf = dict(self._idf)
+            total = self.recipe_count - len(remove_ids)  # Removals are only counted once published
+            for name in touched:
+                if name in index:
+                    idf[name] = self._idf_value(len(index[name]), total)
+                else:
+                    idf.pop(name, None)
+            if self._step_index is not None:
+                self._step_index.apply(
+                    [(recipe_id, self.recipes[recipe_id].steps) for recipe_id in remove_ids],
+                    [(recipe_id, self.recipes[recipe_id].steps) for recipe_id in added_ids],
+                )
+            for recipe_id in added_ids:
+                names = {ing.name for ing in self.recipes[recipe_id].ingredients}
+                self._recipe_weights.append(sum(idf[name] for name in names))
+                if self._similarity_index is not None:  # Indexes not built yet pick up the change when they are
+                    self._similarity_index.add(recipe_id, names)
+
+            # Publish: everything below is quick, so lookups by name switch over together with the ingredient index
+            if self._similarity_index is not None:
+                for recipe_id in remove_ids:
+                    self._similarity_index.remove(recipe_id)
+            if self._name_index is not None:
+                # An update keeps its name, so the entry moves to the new id in one step and never reads as missing
+                added_by_name = {self.recipes[recipe_id].name: recipe_id for recipe_id in reversed(added_ids)}
+                replaced = set()
+                for recipe_id in remove_ids:
+                    name = self.recipes[recipe_id].name
+                    if name in added_by_name:
+                        new_id = added_by_name.pop(name)
+                        self._name_index.replace(name, recipe_id, new_id)
+                        replaced.add(new_id)
+                    else:
+                        self._name_index.remove(name, recipe_id)
+                for recipe_id in added_ids:
+                    if recipe_id not in replaced:
+                        self._name_index.add(self.recipes[recipe_id].name, recipe_id)
+            for recipe_id in remove_ids:
+                self._live[recipe_id] = 0
+            self._dead_recipes += len(remove_ids)
+            self._weights_stale = True
+            self._idf = idf
+            self.ingredient_index = index
+            self.catalog_version += 1
+            metrics.increment("catalog_updates")
+            return added_ids
+
+    def _live_id(self, recipe_name: str) -> int:
+        recipe_id = self.name_index.get(recipe_name.strip().lower())
+        if recipe_id is None:
+            raise KeyError(f"No recipe named {recipe_name!r}")
+        return recipe_id
+
+    def add_recipe(self, recipe: Recipe) -> int:
+        return self._apply_changes([], [recipe])[0]
+
+    def update_recipe(self, recipe_name: str, recipe: Recipe) -> int:
+        # The new version gets a fresh id, so it moves to the end of catalog order
+        return self._apply_changes([recipe_name], [recipe])[0]
+
+    def remove_recipe(self, recipe_name: str):
+        self._apply_changes([recipe_name], [])
+
+    def compact(self) -> "AIEngine":
+        # Fresh engine without dead entries and with exact IDF weights
+        return AIEngine(self.live_recipes())
+
+    def _refresh_weights(self):
+        # Recomputes every IDF value and recipe weight for the current catalog size, once per batch of updates,
+        # so tfidf scores match an engine rebuilt from the live recipes
+        if not getattr(self, "_weights_stale", False):
+            return
+        with self._write_lock:
+            if not self._weights_stale:
+                return
+            with metrics.timer("weights_refresh"):
+                total = self.recipe_count
+                idf = {name: self._idf_value(len(postings), total) for name, postings in self.ingredient_index.items()}
+                # Removed recipes are never scored; their ingredients may be gone from the vocabulary
+                self._recipe_weights = [
+                    sum(idf.get(name, 0.0) for name in {ing.name for ing in recipe.ingredients}) for recipe in self.recipes
+                ]
+                self._idf = idf
+                self._weights_stale = False
+
+    @staticmethod
+    def _query_names(available_ingredients: List[Ingredient]) -> List[str]:
+        return list(dict.fromkeys(ingredient.name for ingredient in available_ingredients))
+
+    def _candidate_ids(
+        self, available_ingredients: List[Ingredient], constraints: Optional[QueryConstraints] = None
+    ) -> List[int]:
+        # Union of the posting lists; only recipes sharing an ingredient are touched
+        index = self.ingredient_index  # One consistent version for the whole query
+        if constraints:
+            return sorted(self._matches(self._query_names(available_ingredients), index, self._idf, constraints)[0])
+        recipe_ids = set()
+        scanned = 0
+        for ingredient in available_ingredients:
+            postings = index.get(ingredient.name, ())
+            scanned += len(postings)
+            recipe_ids.update(postings)
+        metrics.increment("postings_scanned", scanned)
+        metrics.increment("candidates_matched", len(recipe_ids))
+        return sorted(recipe_ids)
+
+    @staticmethod
+    def _contains(postings, recipe_id: int) -> bool:
+        # Posting lists are sorted, so membership is a binary search instead of building a set
+        position = bisect.bisect_left(postings, recipe_id)
+        return position < len(postings) and postings[position] == recipe_id
+
+    def _required_ids(self, index: Dict[str, List[int]], constraints: QueryConstraints) -> set:
+        # Intersection of the required posting lists, smallest first, probing the longer lists by binary search
+        lists = sorted((index.get(name, ()) for name in constraints.required), key=len)
+        allowed = set(lists[0])
+        for postings in lists[1:]:
+            allowed = {recipe_id for recipe_id in allowed if self._contains(postings, recipe_id)}
+        for name in constraints.excluded:
+            postings = index.get(name, ())
+            allowed = {recipe_id for recipe_id in allowed if not self._contains(postings, recipe_id)}
+        return allowed
+
+    def _matches(
+        self, query_names: List[str], index: Dict[str, List[int]], idf: Dict[str, float],
+        constraints: Optional[QueryConstraints],
+    ) -> Tuple[Dict[int, int], Dict[int, float]]:
+        # Matched ingredient count and IDF weight per recipe sharing at least one query ingredient.
+        # Constraints narrow the candidate set before counting rather than filtering a full result list.
+        matched = defaultdict(int)
+        matched_weight = defaultdict(float)
+        scanned = 0
+        counts = self._ingredient_counts
+        # A recipe with more than len(query_names) + max_missing ingredients misses too many whatever it matches,
+        # so it is skipped during the walk instead of being counted and filtered out afterwards
+        limit = len(query_names) + constraints.max_missing if constraints and constraints.max_missing is not None else None
+        allowed = self._required_ids(index, constraints) if constraints and constraints.required else None
+        if allowed is not None and limit is not None:
+            allowed = {recipe_id for recipe_id in allowed if counts[recipe_id] <= limit}
+        if allowed is not None and len(allowed) < sum(len(index.get(name, ())) for name in query_names):
+            # Fewer candidates than postings to walk: check each candidate's own ingredients instead
+            weights = {name: idf.get(name, 0.0) for name in query_names}
+            for recipe_id in allowed:
+                for name in {ingredient.name for ingredient in self.recipes[recipe_id].ingredients}:
+                    if name in weights:
+                        matched[recipe_id] += 1
+                        matched_weight[recipe_id] += weights[name]
+            scanned = len(allowed)
+        else:
+            excluded = set()
+            if constraints and allowed is None:
+                for name in constraints.excluded:
+                    excluded.update(index.get(name, ()))
+            for name in query_names:
+                weight = idf.get(name, 0.0)
+                postings = index.get(name, ())
+                scanned += len(postings)
+                for recipe_id in postings:
+                    if recipe_id in excluded or (allowed is not None and recipe_id not in allowed):
+                        continue
+                    if limit is not None and allowed is None and counts[recipe_id] > limit:
+                        continue
+                    matched[recipe_id] += 1
+                    matched_weight[recipe_id] += weight
+        if limit is not None:
+            max_missing = constraints.max_missing
+            matched = {recipe_id: count for recipe_id, count in matched.items() if counts[recipe_id] - count <= max_missing}
+        metrics.increment("postings_scanned", scanned)
+        metrics.increment("candidates_matched", len(matched))
+        return matched, matched_weight
+
+    def _score(self, recipe_id: int, matched: int, matched_weight: float, query_size: int, scoring: str) -> float:
+        total = self._ingredient_counts[recipe_id]
+        if scoring == "coverage":
+            return matched / total
+        if scoring == "jaccard":
+            return matched / (total + query_size - matched)
+        return matched_weight / self._recipe_weights[recipe_id]
+
+    @timed("rank_recipes", profile=True)
+    def rank_recipes(
+        self,
+        available_ingredients: List[Ingredient],
+        top_k: int = MAX_SUGGESTIONS,
+        scoring: str = "coverage",
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[Tuple[Recipe, float]]:
+        ranked = self._ranked_ids(available_ingredients, top_k, scoring, constraints)
+        metrics.increment("results_returned", len(ranked))
+        return [(self.recipes[recipe_id], score) for recipe_id, score in ranked]
+
+    def _scored_candidates(
+        self, available_ingredients: List[Ingredient], scoring: str, constraints: Optional[QueryConstraints] = None
+    ) -> Iterator[Tuple[float, int, int]]:
+        # (score, matched count, -recipe id): larger tuples rank first, so ties favour more matches, then catalog order
+        if scoring not in SCORING_METHODS:
+            raise ValueError(f"Unknown scoring method {scoring!r}, expected one of {SCORING_METHODS}")
+        query_names = self._query_names(available_ingredients)
+        if scoring == "tfidf":
+            self._refresh_weights()
+        # One consistent index version for the whole query
+        matched, matched_weight = self._matches(query_names, self.ingredient_index, self._idf, constraints)
+        return (
+            (self._score(recipe_id, count, matched_weight[recipe_id], len(query_names), scoring), count, -recipe_id)
+            for recipe_id, count in matched.items()
+        )
+
+    def _ranked_ids(
+        self, available_ingredients: List[Ingredient], top_k: int, scoring: str,
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[Tuple[int, float]]:
+        scored = self._scored_candidates(available_ingredients, scoring, constraints)
+        if top_k <= 0:
+            return []
+        # Bounded heap keeps only top_k candidates
+        return [(-neg_id, score) for score, _, neg_id in heapq.nlargest(top_k, scored)]
+
+    def _suggested_ids(
+        self, available_ingredients: List[Ingredient], top_k: Optional[int], scoring: str,
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[int]:
+        if top_k is not None:  # Ranked mode
+            return [recipe_id for recipe_id, _ in self._ranked_ids(available_ingredients, top_k, scoring, constraints)]
+        return self._candidate_ids(available_ingredients, constraints)
+
+    @timed("suggest_recipes", profile=True)
+    def suggest_recipes(
+        self,
+        available_ingredients: List[Ingredient],
+        top_k: Optional[int] = None,
+        scoring: str = "coverage",
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[Recipe]:
+        recipe_ids = self._suggested_ids(available_ingredients, top_k, scoring, constraints)
+        metrics.increment("results_returned", len(recipe_ids))
+        # Snapshot catalogs hand out their recipe views as a list, so unranked results stay plain list lookups
+        recipes = getattr(self.recipes, "views", self.recipes)
+        return [recipes[recipe_id] for recipe_id in recipe_ids]
+
+    def suggest_recipes_batch(
+        self,
+        ingredient_lists: Iterable[List[Ingredient]],
+        top_k: Optional[int] = None,
+        scoring: str = "coverage",
+        processes: Optional[int] = 1,
+        chunk_size: int = 256,
+        constraints: Optional[QueryConstraints] = None,
+    ) -> Iterator[List[Recipe]]:
+        # Streams one result list per input, in input order; processes=None uses every core
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes <= 1:
+            for available_ingredients in ingredient_lists:
+                yield self.suggest_recipes(available_ingredients, top_k, scoring, constraints)
+            return
+
+        # Workers may see a compacted copy of the catalog, so ids are resolved against that same copy
+        engine = self.compact() if getattr(self, "_dead_recipes", 0) else self
+        chunks = _parallel_suggested_ids(engine, ingredient_lists, top_k, scoring, processes, chunk_size, constraints)
+        for chunk_ids in chunks:
+            for recipe_ids in chunk_ids:
+                yield [engine.recipes[recipe_id] for recipe_id in recipe_ids]
+
+    @timed("search_recipes", profile=True)
+    def search_recipes(
+        self,
+        query: str,
+        top_k: int = MAX_SUGGESTIONS,
+        available_ingredients: Optional[List[Ingredient]] = None,
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[Tuple[Recipe, float]]:
+        # BM25 search over the steps, optionally limited to what suggest_recipes would return
+        # for the same ingredients and constraints
+        index = self.ingredient_index
+        candidates, accept = None, None
+        if available_ingredients:
+            candidates = set(self._matches(self._query_names(available_ingredients), index, self._idf, constraints)[0])
+        elif constraints:
+            if constraints.required:
+                candidates = self._required_ids(index, constraints)
+            blocked = set()
+            if not constraints.required:  # _required_ids already dropped the excluded recipes
+                for name in constraints.excluded:
+                    blocked.update(index.get(name, ()))
+            max_missing = constraints.max_missing
+
+            def accept(recipe_ids):
+                # Without a pantry every ingredient of the recipe counts as missing
+                import numpy as np
+
+                keep = ~np.isin(recipe_ids, np.fromiter(blocked, dtype=np.int64, count=len(blocked)))
+                if max_missing is not None:
+                    keep &= np.asarray(self._ingredient_counts)[recipe_ids] <= max_missing
+                return keep
+        ranked = self.step_index.search(query, top_k, candidates, accept)
+        metrics.increment("results_returned", len(ranked))
+        return [(self.recipes[recipe_id], score) for recipe_id, score in ranked]
+
+    @timed("get_recipe_by_name", profile=True)
+    def get_recipe_by_name(self, recipe_name: str, max_distance: int = 0) -> Recipe:
+        recipe_name = recipe_name.strip().lower()
+        recipe_id = self.name_index.get(recipe_name)
+        if recipe_id is None and max_distance > 0:  # Typo-tolerant fallback
+            metrics.increment("fuzzy_name_lookups")
+            matches = self.name_index.fuzzy(recipe_name, max_distance, limit=1)
+            if matches:
+                recipe_id = self.name_index.get(matches[0][0])
+        metrics.increment("name_lookup_hits" if recipe_id is not None else "name_lookup_misses")
+        return None if recipe_id is None else self.recipes[recipe_id]
+
+    @timed("similar_recipes")
+    def similar_recipes(self, recipe_name: str, top_k: int = SIMILAR_RECIPES) -> List[Tuple[Recipe, float]]:
+        # LSH candidates re-ranked by exact ingredient Jaccard similarity; other entries with the same name are skipped
+        recipe_name = recipe_name.strip().lower()
+        recipe_id = self.name_index.get(recipe_name)
+        if recipe_id is None:
+            return []
+        ingredient_ids = set(self.recipes[recipe_id].ingredient_ids)
+        scored = []
+        candidates = self.similarity_index.candidates(recipe_id)
+        for candidate_id in candidates:
+            candidate = self.recipes[candidate_id]
+            if candidate.name == recipe_name:
+                continue
+            other_ids = set(candidate.ingredient_ids)
+            scored.append((len(ingredient_ids & other_ids) / len(ingredient_ids | other_ids), -candidate_id))
+        metrics.increment("similarity_candidates", len(candidates))
+        return [(self.recipes[-neg_id], score) for score, neg_id in heapq.nlargest(top_k, scored)]
+
+    def complete_recipe_names(self, prefix: str, limit: int = 10) -> List[str]:
+        return self.name_index.complete(prefix.strip().lower(), limit)
+
+    def find_similar_names(self, recipe_name: str, max_distance: int = 2, limit: int = 5) -> List[Tuple[str, int]]:
+        return self.name_index.fuzzy(recipe_name.strip().lower(), max_distance, limit)
+
+
+class QueryLog:
+    # Append-only JSONL of ingredient queries, one {"ingredients": [...]} object per line
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._handle = None
+
+    def record(self, names: Iterable[str]):
+        line = json.dumps({"ingredients": sorted(names)}) + "\n"
+        with self._lock:
+            if self._handle is None:
+                self._handle = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._handle.write(line)
+
+    def close(self):
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+def popular_pantries(path: str, limit: int = WARMUP_PANTRIES) -> List[List[Ingredient]]:
+    # Most frequent distinct ingredient sets in a query log. Lines without a list of non-empty
+    # "ingredients" strings are skipped, so transcribe_batch output works as a log too and a
+    # damaged line never stops the engine from starting.
+    counts = Counter()
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            names = entry.get("ingredients") if isinstance(entry, dict) else None
+            if not isinstance(names, list) or not names:
+                continue
+            if all(isinstance(name, str) and name.strip() for name in names):
+                counts[frozenset(map(canonical_ingredient_name, names))] += 1
+    return [[Ingredient.query(name) for name in sorted(pantry)] for pantry, _ in counts.most_common(limit)]
+
+
+class _InFlight:
+    # One running computation that identical concurrent queries wait on instead of repeating
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CachedAIEngine:
+    # Thread-safe LRU + TTL result cache in front of an AIEngine; other attributes pass through.
+    # Keys ignore ingredient order and duplicates, and the cache empties when catalog_version moves.
+    # Identical queries arriving while one is being computed share its result (single-flight), and
+    # warmed-up popular pantries stay pinned regardless of TTL.
+    def __init__(
+        self, engine: AIEngine, maxsize: int = QUERY_CACHE_SIZE, ttl: float = QUERY_CACHE_TTL,
+        query_log: Optional[QueryLog] = None,
+    ):
+        self.engine = engine
+        self.query_log = query_log
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._pinned: Dict[tuple, Tuple[int, tuple]] = {}  # (pantry, scoring) -> (top_k, ranked results)
+        self._in_flight: Dict[tuple, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()  # Serializes updates with swapping in a compacted engine
+        self._catalog_version = engine.catalog_version
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __getattr__(self, name):
+        return getattr(self.engine, name)
+
+    def _sync_version(self) -> int:
+        # Caller holds self._lock
+        if self.engine.catalog_version != self._catalog_version:
+            self._cache.clear()
+            self._pinned.clear()
+            self._catalog_version = self.engine.catalog_version
+        return self._catalog_version
+
+    def _cached(self, key: tuple, compute) -> list:
+        with self._lock:
+            version = self._sync_version()
+            result = self._cache.get(key)
+            if result is not None:
+                self.hits += 1
+                metrics.increment("query_cache_hits")
+                return list(result)
+            flight = self._in_flight.get((version, key))
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[(version, key)] = _InFlight()
+                self.misses += 1
+                metrics.increment("query_cache_misses")
+            else:
+                self.coalesced += 1
+                metrics.increment("query_coalesced")
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return list(flight.result)
+
+        try:
+            flight.result = tuple(compute())
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[(version, key)]
+                if flight.error is None and self.engine.catalog_version == version:
+                    self._cache[key] = flight.result  # Never store an answer computed against an old catalog
+            flight.done.set()
+        return list(flight.result)
+
+    # Updates go through the wrapper, so none of them can land on an engine that compact() is replacing
+    def add_recipe(self, recipe: Recipe) -> int:
+        with self._update_lock:
+            recipe_id = self.engine.add_recipe(recipe)
+        self._compact_if_sparse()
+        return recipe_id
+
+    def update_recipe(self, recipe_name: str, recipe: Recipe) -> int:
+        with self._update_lock:
+            recipe_id = self.engine.update_recipe(recipe_name, recipe)
+        self._compact_if_sparse()
+        return recipe_id
+
+    def remove_recipe(self, recipe_name: str):
+        with self._update_lock:
+            self.engine.remove_recipe(recipe_name)
+        self._compact_if_sparse()
+
+    def _compact_if_sparse(self):
+        engine = self.engine
+        if engine._dead_recipes > COMPACT_DEAD_RATIO * len(engine.recipes):
+            self.compact()
+
+    def compact(self) -> AIEngine:
+        # Rebuilds the live catalog (dropping dead entries, with exact weights) and swaps it in with one
+        # assignment. Queries keep running against the old engine meanwhile; ids are renumbered, so the
+        # new engine gets the next catalog_version and cached results are dropped.
+        with self._update_lock:
+            current = self.engine
+            with metrics.timer("engine_compact"):
+                engine = current.compact()
+                # Indexes the old engine had built are built before the swap, so no query pays for them
+                for name in ("name_index", "step_index", "similarity_index"):
+                    if getattr(current, f"_{name}", None) is not None:
+                        getattr(engine, name)
+            engine.catalog_version = current.catalog_version + 1
+            self.engine = engine
+        metrics.increment("engine_compactions")
+        return engine
+
+    @staticmethod
+    def _ingredient_key(available_ingredients: List[Ingredient]) -> frozenset:
+        return frozenset(ingredient.name for ingredient in available_ingredients)
+
+    def record_query(self, available_ingredients: List[Ingredient]):
+        # Called once per user query (form submission, API request), not per page view or rerun,
+        # so the log counts how often a pantry is asked for
+        pantry = self._ingredient_key(available_ingredients)
+        if self.query_log is not None and pantry:
+            self.query_log.record(pantry)
+
+    def warm_up(
+        self, pantries: Iterable[List[Ingredient]], top_k: int = WARMUP_TOP_K, scorings: Iterable[str] = ("coverage",)
+    ) -> int:
+        # Ranks each pantry ahead of time; later rank_recipes calls with top_k up to this one are served from it
+        warmed = 0
+        with metrics.timer("query_warmup"):
+            for pantry in pantries:
+                pantry_key = self._ingredient_key(pantry)
+                for scoring in scorings:
+                    with self._lock:
+                        version = self._sync_version()
+                    ranked = tuple(self.engine.rank_recipes(pantry, top_k, scoring))
+                    with self._lock:
+                        if self.engine.catalog_version == version:
+                            self._pinned[(pantry_key, scoring)] = (top_k, ranked)
+                            warmed += 1
+        metrics.increment("query_warmed", warmed)
+        return warmed
+
+    def suggest_recipes(
+        self,
+        available_ingredients: List[Ingredient],
+        top_k: Optional[int] = None,
+        scoring: str = "coverage",
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[Recipe]:
+        key = ("suggest", self._ingredient_key(available_ingredients), top_k, scoring, constraints or None)
+        return self._cached(key, lambda: self.engine.suggest_recipes(available_ingredients, top_k, scoring, constraints))
+
+    def rank_recipes(
+        self,
+        available_ingredients: List[Ingredient],
+        top_k: int = MAX_SUGGESTIONS,
+        scoring: str = "coverage",
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[Tuple[Recipe, float]]:
+        pantry = self._ingredient_key(available_ingredients)
+        if not constraints:
+            with self._lock:
+                self._sync_version()
+                pinned = self._pinned.get((pantry, scoring))
+                if pinned is not None and top_k <= pinned[0]:
+                    self.hits += 1
+                    metrics.increment("query_cache_hits")
+                    return list(pinned[1][:top_k])
+        key = ("rank", pantry, top_k, scoring, constraints or None)
+        return self._cached(key, lambda: self.engine.rank_recipes(available_ingredients, top_k, scoring, constraints))
+
+    def search_recipes(
+        self,
+        query: str,
+        top_k: int = MAX_SUGGESTIONS,
+        available_ingredients: Optional[List[Ingredient]] = None,
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[Tuple[Recipe, float]]:
+        ingredient_key = self._ingredient_key(available_ingredients or [])
+        key = ("search", " ".join(query.lower().split()), ingredient_key, top_k, constraints or None)
+        return self._cached(key, lambda: self.engine.search_recipes(query, top_k, available_ingredients, constraints))
+
+    def similar_recipes(self, recipe_name: str, top_k: int = SIMILAR_RECIPES) -> List[Tuple[Recipe, float]]:
+        key = ("similar", recipe_name.strip().lower(), top_k)
+        return self._cached(key, lambda: self.engine.similar_recipes(recipe_name, top_k))
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._cache),
+                "pinned": len(self._pinned),
+                "maxsize": self._cache.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Initialize Recipes Dataset
+@timed("initialize_recipes")
+def initialize_recipes() -> List[Recipe]:
+    return [
+    Recipe(
+        "Biryani",
+        ["rice", "chicken", "yogurt", "spices", "onion"],
+        "1. Marinate chicken with yogurt and spices.\n2. Fry onions until golden brown.\n3. Layer rice, chicken, and fried onions in a pot.\n4. Cook on low heat until rice is fully cooked."
+    ),
+    Recipe(
+        "Fried Chicken",
+        ["chicken pieces", "flour", "spices", "garlic powder", "oil"],
+        "1. Marinate chicken with spices and garlic powder.\n2. Coat chicken pieces in flour.\n3. Fry in hot oil until crispy."
+    ),
+    Recipe(
+        "Methi Thepla",
+        ["fenugreek leaves", "flour", "yogurt", "spices", "oil"],
+        "1. Make dough with fenugreek leaves, flour, yogurt, and spices.\n2. Roll out into flatbreads and cook on a griddle with a little oil."
+    ),
+    Recipe(
+        "Sajji",
+        ["whole chicken", "spices", "yogurt", "garlic", "lemon"],
+        "1. Marinate chicken with yogurt, spices, garlic, and lemon juice.\n2. Roast the whole chicken until tender."
+    ),
+    Recipe(
+        "Dahi Ke Kebab",
+        ["yogurt", "paneer", "spices", "ginger", "cilantro"],
+        "1. Mix yogurt, paneer, and spices.\n2. Shape into kebabs and cook on a grill or fry in a pan."
+    ),
+    Recipe(
+        "Korma",
+        ["chicken", "onion", "yogurt", "spices", "garlic"],
+        "1. Brown onions and garlic.\n2. Add chicken and spices.\n3. Cook with yogurt until tender."
+    ),
+    Recipe(
+        "Peshawari Chapli Kebab",
+        ["minced beef", "onion", "tomato", "spices", "green chilies"],
+        "1. Mix minced beef with onions, tomatoes, chilies, and spices.\n2. Shape into patties and fry."
+    ),
+    Recipe(
+        "Lassi",
+        ["yogurt", "water", "sugar", "mint"],
+        "1. Blend yogurt, water, sugar, and mint.\n2. Serve chilled."
+    ),
+    Recipe(
+        "Palak Gosht",
+        ["mutton", "spinach", "onion", "garlic", "spices"],
+        "1. Fry onions and garlic.\n2. Add mutton and cook until browned.\n3. Add spinach and spices, cook until tender."
+    ),
+    Recipe(
+        "Bhel Puri",
+        ["puffed rice", "onion", "tomato", "coriander", "tamarind chutney"],
+        "1. Mix puffed rice with chopped vegetables and coriander.\n2. Add tamarind chutney and spices."
+    ),
+    Recipe(
+        "Shami Kebab",
+        ["minced meat", "lentils", "onion", "spices", "egg"],
+        "1. Cook minced meat with lentils and spices.\n2. Grind into a smooth mixture, shape into patties, and fry."
+    ),
+    Recipe(
+        "Tandoori Roti",
+        ["flour", "yeast", "water", "salt", "ghee"],
+        "1. Make dough with yeast and flour.\n2. Roll into rotis and bake in a tandoor.\n3. Brush with ghee."
+    ),
+    Recipe(
+        "Chicken Jalfrezi",
+        ["chicken", "bell peppers", "onion", "tomato", "spices"],
+        "1. Stir-fry chicken with onions, bell peppers, and tomatoes.\n2. Add spices and cook until tender."
+    ),
+    Recipe(
+        "Mutton Seekh Kebab",
+        ["minced mutton", "onions", "green chilies", "spices", "coriander"],
+        "1. Mix minced mutton with onions, chilies, and spices.\n2. Shape into skewers and grill or fry."
+    ),
+    Recipe(
+        "Gajar Ka Halwa",
+        ["carrots", "milk", "sugar", "ghee", "cardamom"],
+        "1. Grate carrots and cook them in milk.\n2. Add sugar, ghee, and cardamom, cook until thick."
+    ),
+    Recipe(
+        "Lemon Rice",
+        ["rice", "lemon", "mustard seeds", "curry leaves", "green chilies"],
+        "1. Cook rice.\n2. Heat mustard seeds, curry leaves, and chilies.\n3. Add lemon juice to rice and mix."
+    ),
+    Recipe(
+        "Chana Chaat",
+        ["chickpeas", "onion", "tomato", "cucumber", "spices"],
+        "1. Boil chickpeas and mix with diced veggies.\n2. Add spices and lemon juice."
+    ),
+    Recipe(
+        "Dahi Puri",
+        ["pani puri shells", "yogurt", "potatoes", "tamarind chutney", "spices"],
+        "1. Fill puris with boiled potatoes.\n2. Add yogurt, tamarind chutney, and sprinkle with spices."
+    ),
+    Recipe(
+        "Pista Kulfi",
+        ["milk", "sugar", "pistachios", "cardamom"],
+        "1. Boil milk with sugar and cardamom until thick.\n2. Add crushed pistachios and freeze in molds."
+    ),
+    Recipe(
+        "Chicken Malai Tikka",
+        ["chicken", "yogurt", "cream", "spices", "lemon juice"],
+        "1. Marinate chicken with yogurt, cream, spices, and lemon juice.\n2. Grill the chicken until cooked."
+    ),
+    Recipe(
+        "Fish Karahi",
+        ["fish", "onion", "tomato", "garlic", "green chilies"],
+        "1. Fry onions and garlic in oil.\n2. Add fish and cook with tomatoes and spices."
+    ),
+    Recipe(
+        "Chana Daal",
+        ["chana daal", "onion", "tomato", "spices", "garlic"],
+        "1. Boil chana daal until tender.\n2. Fry onions and tomatoes with spices.\n3. Add to daal and cook for a few minutes."
+    ),
+    Recipe(
+        "Methi Aloo",
+        ["potatoes", "fenugreek leaves", "onions", "spices"],
+        "1. Fry onions until golden.\n2. Add potatoes and spices, cook until tender.\n3. Add fenugreek leaves and cook for a few more minutes."
+    ),
+    Recipe(
+        "Samosa",
+        ["flour", "potatoes", "peas", "spices", "oil"],
+        "1. Boil and mash potatoes and peas.\n2. Add spices and fill the mixture into rolled dough triangles.\n3. Deep fry until golden."
+    ),
+    Recipe(
+        "Vegetable Biryani",
+        ["rice", "vegetables", "yogurt", "spices", "onion"],
+        "1. Marinate vegetables with yogurt and spices.\n2. Layer rice, vegetables, and fried onions.\n3. Cook until rice is done."
+    ),
+    Recipe(
+        "Kebabs",
+        ["minced meat", "onion", "spices", "garlic"],
+        "1. Mix minced meat with spices and onions.\n2. Shape into skewers and grill or fry."
+    ),
+    Recipe(
+        "Masala Chai",
+        ["tea leaves", "milk", "cardamom", "ginger", "sugar"],
+        "1. Boil tea leaves, ginger, and cardamom in water.\n2. Add milk and sugar, simmer until it boils."
+    ),
+    Recipe(
+        "Mutton Pulao",
+        ["mutton", "rice", "onion", "garlic", "spices"],
+        "1. Brown mutton with onions and garlic.\n2. Add rice and spices, cook until rice is tender."
+    ),
+    Recipe(
+        "Haleem",
+        ["wheat", "lentils", "chicken", "spices", "ghee"],
+        "1. Cook wheat and lentils until soft.\n2. Blend the mixture and add cooked chicken.\n3. Simmer with spices and ghee."
+    ),
+    Recipe(
+        "Aloo Keema",
+        ["minced meat", "potatoes", "onion", "tomato", "spices"],
+        "1. Cook minced meat with onions, tomatoes, and spices.\n2. Add diced potatoes and cook until tender."
+    ),
+    Recipe(
+        "Zarda",
+        ["rice", "sugar", "milk", "cardamom", "saffron"],
+        "1. Cook rice with sugar, milk, and cardamom.\n2. Add saffron and garnish with nuts."
+    ),
+    Recipe(
+        "Dahi Bhalla",
+        ["dal", "yogurt", "tamarind chutney", "spices", "cilantro"],
+        "1. Soak dal vadas in water and top with yogurt.\n2. Add tamarind chutney and sprinkle spices."
+    ),
+    Recipe(
+        "Pani Puri",
+        ["puri shells", "potatoes", "chickpeas", "spices", "tamarind chutney"],
+        "1. Fill puris with chickpeas and potatoes.\n2. Pour tamarind chutney and top with spices."
+    ),
+    Recipe(
+        "Shahi Malai",
+        ["milk", "sugar", "cardamom", "saffron", "ghee"],
+        "1. Boil milk with sugar and cardamom.\n2. Garnish with saffron and ghee."
+    ),
+    Recipe(
+        "Vegetable Samosa",
+        ["flour", "potatoes", "peas", "spices", "oil"],
+        "1. Prepare dough and roll it out.\n2. Fill with a mixture of vegetables and spices.\n3. Fry until golden."
+    ),
+    Recipe(
+        "Methi Paratha",
+        ["flour", "fenugreek leaves", "spices", "ghee"],
+        "1. Make dough with fenugreek leaves, flour, and spices.\n2. Roll out into parathas and cook on a griddle with ghee."
+    ),
+    Recipe(
+        "Mutton Karahi",
+        ["mutton", "onion", "tomato", "garlic", "spices"],
+        "1. Fry onions and garlic in oil.\n2. Add mutton and cook until browned.\n3. Add tomatoes and spices, cook until tender."
+    ),
+    Recipe(
+        "Pasta",
+        ["pasta", "tomato sauce", "chicken", "garlic", "cheese"],
+        "1. Cook pasta.\n2. Stir-fry chicken with garlic and tomato sauce.\n3. Mix pasta with chicken and top with cheese."
+    ),
+    Recipe(
+        "Chana Daal Tikki",
+        ["chana daal", "spices", "green chilies", "onions"],
+        "1. Boil chana daal and mash it.\n2. Shape into patties and fry until golden brown."
+    ),
+    Recipe(
+        "Fried Fish",
+        ["fish", "spices", "flour", "oil"],
+        "1. Marinate fish with spices.\n2. Coat in flour and deep fry until crispy."
+    ),
+    Recipe(
+        "Pasta Karahi",
+        ["pasta", "chicken", "tomato", "green chilies", "spices"],
+        "1. Cook pasta.\n2. Cook chicken with tomatoes and spices.\n3. Toss pasta in the chicken mixture."
+    ),
+    Recipe(
+        "Chana Masala",
+        ["chickpeas", "onion", "tomato", "garlic", "spices"],
+        "1. Boil chickpeas until tender.\n2. Fry onions and tomatoes, add spices.\n3. Add chickpeas and cook together."
+    ),
+    Recipe(
+        "Bengan Bharta",
+        ["eggplant", "onion", "tomato", "garlic", "spices"],
+        "1. Roast eggplant until soft.\n2. Mash and cook with onions, tomatoes, garlic, and spices."
+    ),
+    Recipe(
+        "Aloo Paratha",
+        ["flour", "potatoes", "spices", "ghee"],
+        "1. Make dough and stuff with spiced mashed potatoes.\n2. Roll out into parathas and cook with ghee."
+    ),
+    Recipe(
+        "Seekh Kebab",
+        ["minced meat", "onion", "green chilies", "spices", "cilantro"],
+        "1. Mix minced meat with onions, spices, and chilies.\n2. Shape into skewers and grill."
+    ),
+    Recipe(
+        "Cucumber Raita",
+        ["yogurt", "cucumber", "spices", "cilantro"],
+        "1. Grate cucumber and mix with yogurt.\n2. Add spices and cilantro."
+    ),
+    Recipe(
+        "Prawn Masala",
+        ["prawns", "onion", "tomato", "spices", "garlic"],
+        "1. Fry onions and garlic in oil.\n2. Add prawns and cook until pink.\n3. Add tomatoes and spices, cook until done."
+    ),
+    Recipe(
+        "Gulab Jamun",
+        ["milk powder", "flour", "sugar", "ghee", "rose water"],
+        "1. Make dough with milk powder and flour.\n2. Shape into balls and fry in ghee.\n3. Soak in sugar syrup with rose water."
+    ),
+    Recipe(
+        "Kacha Gola",
+        ["crushed ice", "syrup", "lemon juice", "salt"],
+        "1. Shave ice and pack it in a cup.\n2. Pour flavored syrup and sprinkle with salt."
+    ),
+
+    Recipe(
+        "Chana Chaat",
+        ["chickpeas", "onion", "tomato", "cucumber", "spices"],
+        "1. Boil chickpeas and chop vegetables.\n2. Add spices and lemon juice.\n3. Mix well and serve."
+    ),
+    Recipe(
+        "Samosa Chaat",
+        ["samosa", "yogurt", "chili chutney", "spices", "coriander"],
+        "1. Crush samosas.\n2. Pour yogurt and chili chutney over it.\n3. Garnish with spices and coriander."
+    ),
+    Recipe(
+        "Chicken Shawarma",
+        ["chicken", "yogurt", "garlic", "spices", "flatbread"],
+        "1. Marinate chicken with yogurt, garlic, and spices.\n2. Grill chicken and slice thin.\n3. Serve in flatbread."
+    ),
+    Recipe(
+        "Kheer",
+        ["milk", "rice", "sugar", "cardamom", "almonds"],
+        "1. Boil rice in milk.\n2. Add sugar, cardamom, and cook until thick.\n3. Garnish with almonds."
+    ),
+    Recipe(
+        "Chicken Pulao",
+        ["chicken", "rice", "onion", "garlic", "spices"],
+        "1. Brown chicken with onions and garlic.\n2. Add rice and spices, cook until rice is done."
+    ),
+    Recipe(
+        "Kacha Gosht",
+        ["mutton", "onions", "ginger", "garlic", "spices"],
+        "1. Marinate mutton with spices.\n2. Cook in a sealed pot with onions, ginger, and garlic."
+    ),
+    Recipe(
+        "Chana Daal",
+        ["chana daal", "onion", "tomato", "garlic", "spices"],
+        "1. Boil chana daal until tender.\n2. Fry onions and tomatoes with spices.\n3. Add to daal and cook."
+    ),
+    Recipe(
+        "Shahi Korma",
+        ["chicken", "yogurt", "cream", "spices", "onion"],
+        "1. Brown onions and cook chicken.\n2. Add yogurt, cream, and spices, cook until thick."
+    ),
+    Recipe(
+        "Egg Bhurji",
+        ["eggs", "onion", "green chilies", "tomato", "spices"],
+        "1. Scramble eggs with onions, tomatoes, and chilies.\n2. Add spices and cook until done."
+    ),
+    Recipe(
+        "Aloo Tikki",
+        ["potatoes", "onion", "spices", "green chilies", "oil"],
+        "1. Boil and mash potatoes.\n2. Shape into patties with onions, chilies, and spices.\n3. Fry until golden."
+    ),
+    Recipe(
+        "Mango Lassi",
+        ["mango", "yogurt", "milk", "sugar"],
+        "1. Blend mango, yogurt, milk, and sugar.\n2. Serve chilled."
+    ),
+    Recipe(
+        "Chicken Korma",
+        ["chicken", "yogurt", "spices", "onion", "garlic"],
+        "1. Fry onions and garlic.\n2. Add chicken and spices, cook until browned.\n3. Add yogurt and simmer."
+    ),
+    Recipe(
+        "Nihari",
+        ["mutton", "onion", "spices", "flour", "garlic"],
+        "1. Cook mutton with onions, garlic, and spices.\n2. Thicken with flour and cook until tender."
+    ),
+    Recipe(
+        "Masala Dosa",
+        ["rice flour", "potatoes", "onion", "spices", "oil"],
+        "1. Make a dosa batter from rice flour.\n2. Cook a spiced potato filling.\n3. Serve dosa with filling."
+    ),
+    Recipe(
+        "Gulab Jamun",
+        ["milk powder", "flour", "sugar", "ghee", "rose water"],
+        "1. Make dough with milk powder and flour.\n2. Shape into balls and fry in ghee.\n3. Soak in sugar syrup with rose water."
+    ),
+    Recipe(
+        "Haleem",
+        ["wheat", "lentils", "chicken", "spices", "ghee"],
+        "1. Cook wheat and lentils until soft.\n2. Blend the mixture and add cooked chicken.\n3. Simmer with spices and ghee."
+    ),
+    Recipe(
+        "Baked Chicken Wings",
+        ["chicken wings", "garlic powder", "paprika", "spices", "oil"],
+        "1. Season chicken wings with garlic, paprika, and spices.\n2. Bake in the oven until crispy."
+    ),
+    Recipe(
+        "Gajar Halwa",
+        ["carrots", "milk", "sugar", "ghee", "cardamom"],
+        "1. Grate carrots and cook them in milk.\n2. Add sugar, ghee, and cardamom, cook until thick."
+    ),
+    Recipe(
+        "Chana Masala",
+        ["chickpeas", "onion", "tomato", "garlic", "spices"],
+        "1. Boil chickpeas until tender.\n2. Fry onions and tomatoes, add spices.\n3. Add chickpeas and cook together."
+    ),
+    Recipe(
+        "Keema Paratha",
+        ["flour", "minced meat", "onion", "spices", "ghee"],
+        "1. Cook minced meat with spices and onions.\n2. Stuff the mixture in paratha dough and cook with ghee."
+    ),
+    Recipe(
+        "Biryani",
+        ["rice", "chicken", "yogurt", "spices", "onion"],
+        "1. Marinate chicken with yogurt and spices.\n2. Fry onions until golden brown.\n3. Layer rice, chicken, and fried onions in a pot.\n4. Cook on low heat until rice is fully cooked."
+    ),
+    Recipe(
+        "Kofta Curry",
+        ["minced meat", "onion", "spices", "garlic", "yogurt"],
+        "1. Make meatballs with minced meat, onions, and spices.\n2. Fry meatballs and add to curry made from garlic, onions, and yogurt."
+    ),
+    Recipe(
+        "Gosht Karahi",
+        ["mutton", "onion", "tomato", "green chilies", "spices"],
+        "1. Fry onions and tomatoes.\n2. Add mutton and cook with spices.\n3. Simmer until tender."
+    ),
+    Recipe(
+        "Aloo Keema",
+        ["minced meat", "potatoes", "onion", "tomato", "spices"],
+        "1. Cook minced meat with onions, tomatoes, and spices.\n2. Add diced potatoes and cook until tender."
+    ),
+    Recipe(
+        "Mutton Seekh Kebab",
+        ["minced mutton", "onions", "green chilies", "spices", "cilantro"],
+        "1. Mix minced mutton with onions, chilies, and spices.\n2. Shape into skewers and grill or fry."
+    ),
+    Recipe(
+        "Methi Paratha",
+        ["flour", "fenugreek leaves", "spices", "ghee"],
+        "1. Make dough with fenugreek leaves and spices.\n2. Roll into parathas and cook on a griddle with ghee."
+    ),
+    Recipe(
+        "Pista Kulfi",
+        ["milk", "sugar", "pistachios", "cardamom"],
+        "1. Boil milk with sugar and cardamom until thick.\n2. Add crushed pistachios and freeze in molds."
+    ),
+    Recipe(
+        "Chana Daal Tikki",
+        ["chana daal", "spices", "green chilies", "onions"],
+        "1. Boil chana daal and mash it.\n2. Shape into patties and fry until golden brown."
+    ),
+    Recipe(
+        "Pasta Karahi",
+        ["pasta", "chicken", "tomato", "green chilies", "spices"],
+        "1. Cook pasta.\n2. Cook chicken with tomatoes and spices.\n3. Toss pasta in the chicken mixture."
+    ),
+    Recipe(
+        "Dahi Bhalla",
+        ["dal", "yogurt", "tamarind chutney", "spices", "cilantro"],
+        "1. Soak dal vadas in water and top with yogurt.\n2. Add tamarind chutney and sprinkle spices."
+    ),
+    Recipe(
+        "Fried Fish",
+        ["fish", "spices", "flour", "oil"],
+        "1. Marinate fish with spices.\n2. Coat in flour and deep fry until crispy."
+    ),
+    Recipe(
+        "Tandoori Roti",
+        ["flour", "yeast", "water", "salt", "ghee"],
+        "1. Make dough with yeast and flour.\n2. Roll into rotis and bake in a tandoor.\n3. Brush with ghee."
+    ),
+    Recipe(
+        "Bhel Puri",
+        ["puffed rice", "onion", "tomato", "coriander", "tamarind chutney"],
+        "1. Mix puffed rice with chopped vegetables and coriander.\n2. Add tamarind chutney and spices."
+    ),
+    Recipe(
+        "Pulao",
+        ["rice", "meat", "onion", "spices"],
+        "1. Brown meat and onion.\n2. Add rice and spices, cook until rice is tender."
+    ),
+    Recipe(
+        "Chana Pulao",
+        ["rice", "chickpeas", "onion", "spices"],
+        "1. Cook chickpeas with onions and spices.\n2. Add rice and cook until tender."
+    ),
+    Recipe(
+        "Sajji",
+        ["whole chicken", "spices", "yogurt", "garlic", "lemon"],
+        "1. Marinate chicken with yogurt, spices, garlic, and lemon juice.\n2. Roast the whole chicken until tender."
+    ),
+    Recipe(
+        "Dahi Ke Kebab",
+        ["yogurt", "paneer", "spices", "ginger", "cilantro"],
+        "1. Mix yogurt, paneer, and spices.\n2. Shape into kebabs and cook on a grill or fry in a pan."
+    ),
+    Recipe(
+        "Lassi",
+        ["yogurt", "water", "sugar", "mint"],
+        "1. Blend yogurt, water, sugar, and mint.\n2. Serve chilled."
+    ),
+]
+
+
+# Streaming catalog loaders: each yields validated Recipe objects one at a time
+def recipe_from_record(record: dict, ingredient_separator: str = ";") -> Recipe:
+    if not isinstance(record, dict):
+        raise ValueError(f"record must be an object, got {type(record).__name__}")
+    name = record.get("name")
+    ingredients = record.get("ingredients")
+    steps = record.get("steps") or ""
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("recipe needs a non-empty 'name'")
+    if isinstance(ingredients, str):
+        ingredients = ingredients.split(ingredient_separator)
+    if not isinstance(ingredients, (list, tuple)):
+        raise ValueError(f"recipe {name!r} needs a list of 'ingredients'")
+    ingredients = [str(ing) for ing in ingredients if ing is not None and str(ing).strip()]
+    if not ingredients:
+        raise ValueError(f"recipe {name!r} has no ingredients")
+    if not isinstance(steps, str):
+        raise ValueError(f"recipe {name!r} has non-text 'steps'")
+    return Recipe(name, ingredients, steps.replace("\r\n", "\n"))
+
+
+def _validated(
+    records: Iterable, source: str, strict: bool, ingredient_separator: str = ";", parse=None
+) -> Iterator[Recipe]:
+    # parse turns a raw record (e.g. one JSONL line) into a dict inside the per-record try,
+    # so a malformed record is skipped like any other invalid one in non-strict mode
+    for position, record in enumerate(records, 1):
+        try:
+            yield recipe_from_record(parse(record) if parse else record, ingredient_separator)
+        except ValueError as error:
+            if strict:
+                raise ValueError(f"{source}, record {position}: {error}") from None
+            logger.warning("Skipping %s, record %d: %s", source, position, error)
+
+
+def _jsonl_lines(path: str) -> Iterator[str]:
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield line
+
+
+def load_recipes_jsonl(path: str, strict: bool = True) -> Iterator[Recipe]:
+    return _validated(_jsonl_lines(path), path, strict, parse=json.loads)  # JSONDecodeError is a ValueError
+
+
+def _csv_records(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8", newline="") as handle:
+        yield from csv.DictReader(handle)
+
+
+def load_recipes_csv(path: str, strict: bool = True, ingredient_separator: str = ";") -> Iterator[Recipe]:
+    return _validated(_csv_records(path), path, strict, ingredient_separator)
+
+
+def _parquet_records(path: str, batch_size: int) -> Iterator[dict]:
+    import pyarrow.parquet as pq  # Only needed for Parquet catalogs
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=["name", "ingredients", "steps"]):
+        yield from batch.to_pylist()
+
+
+def load_recipes_parquet(path: str, strict: bool = True, batch_size: int = 10_000) -> Iterator[Recipe]:
+    return _validated(_parquet_records(path, batch_size), path, strict)
+
+
+CATALOG_LOADERS = {
+    ".jsonl": load_recipes_jsonl,
+    ".csv": load_recipes_csv,
+    ".parquet": load_recipes_parquet,
+}
+
+
+def load_recipes(path: str, strict: bool = True) -> Iterator[Recipe]:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in CATALOG_LOADERS:
+        raise ValueError(f"Unsupported catalog format {extension!r}, expected one of {sorted(CATALOG_LOADERS)}")
+    return CATALOG_LOADERS[extension](path, strict=strict)
+
+
+# Binary catalog snapshots: compiled once, then memory-mapped and queried in place
+SNAPSHOT_MAGIC = b"RCPSNAP5"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+
+def _pack_strings(strings: Iterable[str]) -> Tuple[array, bytes]:
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for string in strings:
+        blob += string.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def _pack_postings(posting_lists: Iterable[Iterable[int]]) -> Tuple[array, array]:
+    indptr = array("Q", [0])
+    values = array("I")
+    for postings in posting_lists:
+        values.extend(postings)
+        indptr.append(len(values))
+    return indptr, values
+
+
+def write_snapshot(engine: AIEngine, path: str):
+    if getattr(engine, "_dead_recipes", 0):
+        engine = engine.compact()
+    engine._refresh_weights()
+    vocabulary = sorted(engine.ingredient_index)
+    vocabulary_ids = {name: ingredient_id for ingredient_id, name in enumerate(vocabulary)}
+    name_index = engine.name_index
+    sorted_names = list(name_index.sorted_names)
+    name_ordinals = {name: ordinal for ordinal, name in enumerate(sorted_names)}
+    trigrams = sorted(name_index.trigram_index)
+    max_length = max(name_index.names_by_length, default=-1)
+
+    sections = {}
+    sections["vocabulary_offsets"], sections["vocabulary"] = _pack_strings(vocabulary)
+    sections["postings_indptr"], sections["postings"] = _pack_postings(engine.ingredient_index[name] for name in vocabulary)
+    sections["idf"] = array("d", [engine._idf[name] for name in vocabulary])
+    sections["recipe_name_offsets"], sections["recipe_names"] = _pack_strings(recipe.name for recipe in engine.recipes)
+    sections["recipe_ingredients_indptr"], sections["recipe_ingredients"] = _pack_postings(
+        [vocabulary_ids[ingredient.name] for ingredient in recipe.ingredients] for recipe in engine.recipes
+    )
+    # Display labels, parallel to recipe_ingredients, as ordinals into a table of distinct labels
+    label_ordinals: Dict[str, int] = {}
+    recipe_labels = array("I")
+    for recipe in engine.recipes:
+        recipe_labels.extend(label_ordinals.setdefault(label, len(label_ordinals)) for label in recipe.ingredient_labels)
+    sections["label_offsets"], sections["labels"] = _pack_strings(label_ordinals)
+    sections["recipe_labels"] = recipe_labels
+    sections["steps_offsets"], sections["steps"] = _pack_strings(recipe.steps for recipe in engine.recipes)
+    sections["ingredient_counts"] = array("I", engine._ingredient_counts)
+    sections["recipe_weights"] = array("d", engine._recipe_weights)
+    sections["sorted_name_offsets"], sections["sorted_names"] = _pack_strings(sorted_names)
+    sections["sorted_name_recipes"] = array("I", [name_index.by_name[name] for name in sorted_names])
+    sections["trigram_offsets"], sections["trigrams"] = _pack_strings(trigrams)
+    sections["trigram_indptr"], sections["trigram_postings"] = _pack_postings(
+        [name_ordinals[name] for name in name_index.trigram_index[gram]] for gram in trigrams
+    )
+    sections["length_indptr"], sections["length_postings"] = _pack_postings(
+        [name_ordinals[name] for name in name_index.names_by_length.get(length, ())] for length in range(max_length + 1)
+    )
+    # Step index: per-term recipe ids, plus one global offsets array into the concatenated positions
+    step_postings = engine.step_index.postings
+    step_terms = sorted(step_postings)
+    sections["step_term_offsets"], sections["step_terms"] = _pack_strings(step_terms)
+    sections["step_postings_indptr"], sections["step_postings"] = _pack_postings(step_postings[term].ids for term in step_terms)
+    position_offsets = array("Q", [0])
+    positions = array("I")
+    for term in step_terms:
+        term_postings = step_postings[term]
+        for index in range(len(term_postings.ids)):
+            positions.extend(term_postings.positions_at(index))
+            position_offsets.append(len(positions))
+    sections["step_position_offsets"], sections["step_positions"] = position_offsets, positions
+    sections["step_lengths"] = array("I", engine.step_index.document_lengths)
+    similarity_index = engine.similarity_index
+    bucket_keys = sorted(similarity_index.buckets)
+    sections["minhash_signatures"] = array("I", similarity_index.signatures)
+    sections["lsh_keys"] = array("Q", bucket_keys)
+    sections["lsh_indptr"], sections["lsh_postings"] = _pack_postings(similarity_index.buckets[key] for key in bucket_keys)
+
+    # Table of contents: section -> [offset, size, typecode]; every section starts 8-byte aligned
+    contents = {}
+    offset = 0
+    for name, data in sections.items():
+        typecode = data.typecode if isinstance(data, array) else "B"
+        size = len(data) * (data.itemsize if isinstance(data, array) else 1)
+        contents[name] = [offset, size, typecode]
+        offset += size + (-size % 8)
+    # Scalars readers would otherwise recompute from a section go in the header too
+    header = json.dumps({"sections": contents, "step_total_length": engine.step_index.total_length}).encode("utf-8")
+    header += b" " * (-len(header) % 8)
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as handle:
+        handle.write(SNAPSHOT_MAGIC + len(header).to_bytes(8, "little") + header)
+        for data in sections.values():
+            raw = data.tobytes() if isinstance(data, array) else data
+            handle.write(raw + b"\0" * (-len(raw) % 8))
+    os.replace(temporary_path, path)  # Readers never see a half-written snapshot
+
+
+class _MappedStrings(Sequence):
+    # Zero-copy string table: n + 1 offsets into a UTF-8 blob
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return str(self.blob[self.offsets[index] : self.offsets[index + 1]], "utf-8")
+
+
+class _MappedPostings(Mapping):
+    # Sorted string keys -> slice of a uint32 array, found by binary search
+    def __init__(self, keys: _MappedStrings, indptr: memoryview, values: memoryview, decode: Sequence = None):
+        self.keys_table = keys
+        self.indptr = indptr
+        self.values = values
+        self.decode = decode
+
+    def position(self, key: str) -> int:
+        position = bisect.bisect_left(self.keys_table, key)
+        if position < len(self.keys_table) and self.keys_table[position] == key:
+            return position
+        return -1
+
+    def __getitem__(self, key: str):
+        position = self.position(key)
+        if position < 0:
+            raise KeyError(key)
+        values = self.values[self.indptr[position] : self.indptr[position + 1]]
+        return values if self.decode is None else [self.decode[value] for value in values]
+
+    def __iter__(self):
+        return iter(self.keys_table)
+
+    def __len__(self):
+        return len(self.keys_table)
+
+
+class _MappedColumn(Mapping):
+    # One value per key of a _MappedPostings table
+    def __init__(self, table: _MappedPostings, values: memoryview):
+        self.table = table
+        self.values = values
+
+    def __getitem__(self, key: str):
+        position = self.table.position(key)
+        if position < 0:
+            raise KeyError(key)
+        return self.values[position]
+
+    def __iter__(self):
+        return iter(self.table)
+
+    def __len__(self):
+        return len(self.table)
+
+
+class _MappedTermPostings(Mapping):
+    # Step term -> _TermPostings over slices of the mapped id, offset and position arrays
+    def __init__(self, table: _MappedPostings, position_offsets: memoryview, positions: memoryview):
+        self.table = table
+        self.position_offsets = position_offsets
+        self.positions = positions
+
+    def __getitem__(self, term: str) -> _TermPostings:
+        position = self.table.position(term)
+        if position < 0:
+            raise KeyError(term)
+        start, end = self.table.indptr[position], self.table.indptr[position + 1]
+        offsets = self.position_offsets[start : end + 1]
+        return _TermPostings(self.table.values[start:end], offsets, self.positions[offsets[0] : offsets[-1]])
+
+    def __iter__(self):
+        return iter(self.table)
+
+    def __len__(self):
+        return len(self.table)
+
+
+class _MappedIntPostings(Mapping):
+    # Sorted integer keys -> slice of a uint32 array, found by binary search
+    def __init__(self, keys: memoryview, indptr: memoryview, values: memoryview):
+        self.keys = keys
+        self.indptr = indptr
+        self.values = values
+
+    def __getitem__(self, key: int):
+        position = bisect.bisect_left(self.keys, key)
+        if position == len(self.keys) or self.keys[position] != key:
+            raise KeyError(key)
+        return self.values[self.indptr[position] : self.indptr[position + 1]]
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class _MappedBuckets(Mapping):
+    # Small integer key (e.g. name length) -> list of decoded postings
+    def __init__(self, indptr: memoryview, values: memoryview, decode: Sequence):
+        self.indptr = indptr
+        self.values = values
+        self.decode = decode
+
+    def __getitem__(self, key: int):
+        if not 0 <= key < len(self.indptr) - 1:
+            raise KeyError(key)
+        return [self.decode[value] for value in self.values[self.indptr[key] : self.indptr[key + 1]]]
+
+    def __iter__(self):
+        return (key for key in range(len(self.indptr) - 1) if self.indptr[key] != self.indptr[key + 1])
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class _MappedRecipe:
+    # Read-only view of one snapshot recipe: fields are decoded from the mapped sections on access,
+    # and nothing is re-canonicalized. Pickles as a plain Recipe.
+    __slots__ = ("_recipes", "_index")
+
+    def __init__(self, recipes: "_MappedRecipes", index: int):
+        self._recipes = recipes
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        return self._recipes.names[self._index]
+
+    @property
+    def ingredients(self) -> List[Ingredient]:
+        return self._recipes.ingredients_of(self._index)
+
+    @property
+    def ingredient_ids(self) -> array:
+        return array("I", [ingredient.id for ingredient in self.ingredients])
+
+    @property
+    def ingredient_labels(self) -> List[str]:
+        return self._recipes.labels_of(self._index)
+
+    @property
+    def steps(self) -> str:
+        return self._recipes.steps[self._index]
+
+    matches_ingredients = Recipe.matches_ingredients
+    __reduce__ = Recipe.__reduce__
+    __repr__ = Recipe.__repr__
+
+
+class _MappedRecipes(Sequence):
+    # Recipe views are created on access; nothing is materialized up front
+    def __init__(self, names: _MappedStrings, ingredients_indptr: memoryview, ingredients: memoryview,
+                 steps: _MappedStrings, vocabulary: _MappedStrings, labels: memoryview, label_table: _MappedStrings):
+        self.names = names
+        self.ingredients_indptr = ingredients_indptr
+        self.ingredients = ingredients
+        self.labels = labels
+        self.label_table = label_table
+        self.steps = steps
+        self.vocabulary = vocabulary
+        self._length = len(names)  # Read on every access, so not recomputed from the offsets each time
+        # Snapshot vocabulary id -> interned Ingredient, filled on first use of each name
+        self._vocabulary_ingredients: List[Optional[Ingredient]] = [None] * len(vocabulary)
+        self._views: Optional[List[_MappedRecipe]] = None
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def views(self) -> List["_MappedRecipe"]:
+        # Every view as a plain list, built on the first bulk lookup; views decode nothing, so keeping them is cheap
+        views = self._views
+        if views is None:
+            views = self._views = [_MappedRecipe(self, index) for index in range(self._length)]
+        return views
+
+    def ingredients_of(self, index: int) -> List[Ingredient]:
+        found = self._vocabulary_ingredients
+        ingredients = []
+        for ingredient_id in self.ingredients[self.ingredients_indptr[index] : self.ingredients_indptr[index + 1]]:
+            ingredient = found[ingredient_id]
+            if ingredient is None:
+                ingredient = found[ingredient_id] = Ingredient(self.vocabulary[ingredient_id])
+            ingredients.append(ingredient)
+        return ingredients
+
+    def labels_of(self, index: int) -> List[str]:
+        labels = self.labels[self.ingredients_indptr[index] : self.ingredients_indptr[index + 1]]
+        return [self.label_table[ordinal] for ordinal in labels]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return _MappedRecipe(self, index)
+
+
+class SnapshotNameIndex(RecipeNameIndex):
+    # Same lookups as RecipeNameIndex, served from the mapped sorted-name and trigram tables
+    def __init__(self, sections: Dict[str, memoryview]):
+        self.sorted_names = _MappedStrings(sections["sorted_name_offsets"], sections["sorted_names"])
+        name_table = _MappedPostings(
+            self.sorted_names, range(len(self.sorted_names) + 1), sections["sorted_name_recipes"]
+        )
+        self.by_name = _MappedColumn(name_table, sections["sorted_name_recipes"])
+        trigrams = _MappedStrings(sections["trigram_offsets"], sections["trigrams"])
+        self.trigram_index = _MappedPostings(
+            trigrams, sections["trigram_indptr"], sections["trigram_postings"], decode=self.sorted_names
+        )
+        self.names_by_length = _MappedBuckets(
+            sections["length_indptr"], sections["length_postings"], decode=self.sorted_names
+        )
+        # The same tables without decoding, for counting shared trigrams on name ordinals
+        self._trigram_ordinals = _MappedPostings(trigrams, sections["trigram_indptr"], sections["trigram_postings"])
+        self._length_ordinals = _MappedBuckets(sections["length_indptr"], sections["length_postings"], decode=None)
+
+    def _fuzzy_candidates(self, name: str, max_distance: int) -> List[str]:
+        # Same candidates as RecipeNameIndex, but only the names that pass the filter are decoded
+        grams = self._trigrams(name)
+        min_shared = len(grams) - 3 * max_distance
+        if min_shared <= 0:
+            indptr, values = self._length_ordinals.indptr, self._length_ordinals.values
+            lengths = range(max(len(name) - max_distance, 0), min(len(name) + max_distance + 1, len(indptr) - 1))
+            ordinals = [ordinal for length in lengths for ordinal in values[indptr[length] : indptr[length + 1]]]
+        else:
+            table = self._trigram_ordinals
+            shared = Counter()
+            for gram in grams:
+                position = table.position(gram)
+                if position >= 0:
+                    shared.update(table.values[table.indptr[position] : table.indptr[position + 1]])
+            ordinals = [ordinal for ordinal, count in shared.items() if count >= min_shared]
+        return [self.sorted_names[ordinal] for ordinal in ordinals]
+
+
+def open_snapshot(path: str) -> AIEngine:
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if bytes(view[: len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a recipe catalog snapshot")
+    header_start = len(SNAPSHOT_MAGIC) + 8
+    header_size = int.from_bytes(view[len(SNAPSHOT_MAGIC) : header_start], "little")
+    header = json.loads(bytes(view[header_start : header_start + header_size]))
+    data_start = header_start + header_size
+    sections = {
+        name: view[data_start + offset : data_start + offset + size].cast(typecode)
+        for name, (offset, size, typecode) in header["sections"].items()
+    }
+
+    vocabulary = _MappedStrings(sections["vocabulary_offsets"], sections["vocabulary"])
+    engine = AIEngine.__new__(AIEngine)
+    engine.recipes = _MappedRecipes(
+        _MappedStrings(sections["recipe_name_offsets"], sections["recipe_names"]),
+        sections["recipe_ingredients_indptr"],
+        sections["recipe_ingredients"],
+        _MappedStrings(sections["steps_offsets"], sections["steps"]),
+        vocabulary,
+        sections["recipe_labels"],
+        _MappedStrings(sections["label_offsets"], sections["labels"]),
+    )
+    engine.ingredient_index = _MappedPostings(vocabulary, sections["postings_indptr"], sections["postings"])
+    engine._idf = _MappedColumn(engine.ingredient_index, sections["idf"])
+    engine._ingredient_counts = sections["ingredient_counts"]
+    engine._recipe_weights = sections["recipe_weights"]
+    engine._name_index = SnapshotNameIndex(sections)
+    engine._step_index = step_index = StepTextIndex()
+    step_index.postings = _MappedTermPostings(
+        _MappedPostings(
+            _MappedStrings(sections["step_term_offsets"], sections["step_terms"]),
+            sections["step_postings_indptr"],
+            sections["step_postings"],
+        ),
+        sections["step_position_offsets"],
+        sections["step_positions"],
+    )
+    step_index.document_lengths = sections["step_lengths"]
+    step_index.total_length = header["step_total_length"]
+    step_index.document_count = len(sections["step_lengths"])
+    step_index.live = bytearray(b"\x01") * step_index.document_count  # Snapshots are compacted, so every id is live
+    engine._similarity_index = similarity_index = RecipeSimilarityIndex()
+    similarity_index.signatures = sections["minhash_signatures"]
+    similarity_index.buckets = _MappedIntPostings(
+        sections["lsh_keys"], sections["lsh_indptr"], sections["lsh_postings"]
+    )
+    engine.catalog_version = 0
+    engine._snapshot = mapped  # Keeps the mapping alive for as long as the engine
+    engine._snapshot_path = path
+    return engine
+
+
+def compile_snapshot(snapshot_path: str, source_path: Optional[str] = None):
+    write_snapshot(AIEngine(load_recipes(source_path) if source_path else initialize_recipes()), snapshot_path)
+
+
+# Batch workers: each process holds one read-only engine, either inherited through fork
+# (copy-on-write, nothing pickled) or opened from a shared memory-mapped snapshot
+_worker_engine: Optional[AIEngine] = None
+
+
+def _init_batch_worker(engine: Optional[AIEngine], snapshot_path: Optional[str]):
+    global _worker_engine
+    _worker_engine = open_snapshot(snapshot_path) if snapshot_path else engine
+
+
+def _suggest_chunk(
+    chunk: List[List[str]], top_k: Optional[int], scoring: str, constraints: Optional[QueryConstraints]
+) -> List[List[int]]:
+    return [
+        _worker_engine._suggested_ids([Ingredient.query(name) for name in names], top_k, scoring, constraints)
+        for names in chunk
+    ]
+
+
+def _parallel_suggested_ids(
+    engine: AIEngine, ingredient_lists: Iterable[List[Ingredient]], top_k: Optional[int], scoring: str,
+    processes: int, chunk_size: int, constraints: Optional[QueryConstraints] = None,
+) -> Iterator[List[List[int]]]:
+    import multiprocessing  # Process pools are only needed for parallel batches
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    snapshot_path = getattr(engine, "_snapshot_path", None)
+    temporary_dir = None
+    if snapshot_path is None and "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+        if snapshot_path is None:
+            # No fork (Windows/macOS spawn): share the index through a temporary snapshot instead of pickling it
+            temporary_dir = tempfile.TemporaryDirectory()
+            snapshot_path = os.path.join(temporary_dir.name, "catalog" + SNAPSHOT_SUFFIX)
+            write_snapshot(engine, snapshot_path)
+
+    # Queries travel as plain name lists, chunk_size at a time
+    queries = iter(ingredient_lists)
+    chunks = iter(lambda: [[ing.name for ing in query] for query in itertools.islice(queries, chunk_size)], [])
+    try:
+        with ProcessPoolExecutor(
+            processes, mp_context=context, initializer=_init_batch_worker,
+            initargs=(None if snapshot_path else engine, snapshot_path),
+        ) as pool:
+            # Bounded window of in-flight chunks keeps memory flat on unbounded inputs
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_suggest_chunk, chunk, top_k, scoring, constraints))
+                if len(pending) >= 2 * processes:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        if temporary_dir is not None:
+            temporary_dir.cleanup()
+
+
+def catalog_fingerprint(path: Optional[str] = RECIPE_CATALOG_PATH) -> str:
+    # Changes whenever the catalog file is replaced or the built-in catalog data is edited
+    if path:
+        stat = os.stat(path)
+        source = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    else:
+        source = repr(initialize_recipes.__wrapped__.__code__.co_consts)
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def create_engine(
+    path: Optional[str] = RECIPE_CATALOG_PATH, query_log_path: Optional[str] = QUERY_LOG_PATH,
+    warmup_pantries: int = WARMUP_PANTRIES, warm_indexes: bool = False,
+) -> CachedAIEngine:
+    if path and path.endswith(SNAPSHOT_SUFFIX):
+        engine = open_snapshot(path)
+    else:
+        engine = AIEngine(load_recipes(path) if path else initialize_recipes())
+    cached = CachedAIEngine(engine, query_log=QueryLog(query_log_path) if query_log_path else None)
+    # Popular pantries from earlier runs are answered before the first request arrives
+    if query_log_path and warmup_pantries > 0 and os.path.exists(query_log_path):
+        cached.warm_up(popular_pantries(query_log_path, warmup_pantries))
+    if warm_indexes:
+        # Long-running servers build the name, step and similarity indexes in the background right away;
+        # batch jobs and tests leave them lazy and only pay for the ones they use
+        threading.Thread(target=cached.warm_indexes, name="index-warmup", daemon=True).start()
+    return cached
+
@@ -0,0 +1,137 @@
+"""Offline voice input with Vosk, restricted to the catalog's ingredient vocabulary.
+
+The model and audio libraries are imported on first use only.
+"""
+import functools
+import heapq
+import itertools
+import json
+import os
+import wave
+import weakref
+from typing import Iterable, Iterator, List, Tuple
+
+from recipe_core import ALIAS_TABLE, CachedAIEngine, Ingredient, canonical_ingredient_name
+
+VOSK_MODEL_PATH = os.environ.get(
+    "VOSK_MODEL_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "vosk-model-small-en-us-0.15")
+)
+VOICE_SAMPLE_RATE = 16000
+VOICE_RECORD_SECONDS = 5
+# Canonical ingredient names behind the recognizer grammar; larger catalogs keep their most common ingredients
+VOICE_GRAMMAR_MAX_PHRASES = int(os.environ.get("VOICE_GRAMMAR_MAX_PHRASES", "2000"))
+
+
+# Offline voice input (Vosk): the model is loaded once per process and decoding is restricted
+# to the catalog's ingredient phrases, which keeps the search graph tiny on CPU-only kiosks
+@functools.lru_cache(maxsize=None)
+def load_vosk_model(path: str = VOSK_MODEL_PATH):
+    import vosk  # Only needed for voice input
+
+    vosk.SetLogLevel(-1)
+    return vosk.Model(path)
+
+
+def _plural(phrase: str) -> str:
+    # English plural of the last word: "green chili" -> "green chilies", "tomato" -> "tomatoes"
+    head, _, word = phrase.rpartition(" ")
+    if word.endswith("y") and word[-2:-1] not in ("", "a", "e", "o", "u"):
+        word = word[:-1] + "ies"
+    elif word.endswith(("s", "x", "z", "ch", "sh", "o")):
+        word += "es"
+    else:
+        word += "s"
+    return f"{head} {word}" if head else word
+
+
+def ingredient_grammar(vocabulary: Iterable[str], labels: Iterable[str] = ()) -> str:
+    # Canonical names, their aliases and plurals, and the catalog's own wording of them ("lentils", "spices"),
+    # each kept only if it normalizes back to a vocabulary name
+    vocabulary = set(vocabulary)
+    phrases = vocabulary | {alias for alias, canonical in ALIAS_TABLE.items() if canonical in vocabulary}
+    phrases |= {_plural(phrase) for phrase in phrases}
+    phrases |= {" ".join(label.lower().split()) for label in labels}
+    phrases = {phrase for phrase in phrases if phrase in vocabulary or canonical_ingredient_name(phrase) in vocabulary}
+    return json.dumps(sorted(phrases) + ["[unk]"])
+
+
+def grammar_vocabulary(engine: CachedAIEngine, max_phrases: int = VOICE_GRAMMAR_MAX_PHRASES) -> List[str]:
+    # The max_phrases ingredients used by the most recipes, so the search graph stays small on any catalog
+    index = engine.ingredient_index
+    if len(index) <= max_phrases:
+        return list(index)
+    return heapq.nlargest(max_phrases, index, key=lambda name: len(index[name]))
+
+
+# Engine -> (catalog_version, vocabulary, grammar); weak, so a reloaded catalog's engine can be freed
+_grammars = weakref.WeakKeyDictionary()
+
+
+def catalog_grammar(engine: CachedAIEngine) -> Tuple[List[str], str]:
+    # Built once per catalog version instead of on every recognition
+    cached = _grammars.get(engine)
+    if cached is None or cached[0] != engine.catalog_version:
+        vocabulary = grammar_vocabulary(engine)
+        labels = {label for recipe in engine.live_recipes() for label in recipe.ingredient_labels}
+        cached = _grammars[engine] = (engine.catalog_version, vocabulary, ingredient_grammar(vocabulary, labels))
+    return cached[1], cached[2]
+
+
+def transcribe_chunks(chunks: Iterable[bytes], sample_rate: int, grammar: str, model_path: str = VOSK_MODEL_PATH) -> Iterator[str]:
+    # Streams 16-bit mono PCM chunks through one recognizer, yielding each finalized utterance
+    import vosk
+
+    recognizer = vosk.KaldiRecognizer(load_vosk_model(model_path), sample_rate, grammar)
+    for chunk in chunks:
+        if recognizer.AcceptWaveform(chunk):
+            text = json.loads(recognizer.Result()).get("text", "")
+            if text:
+                yield text
+    text = json.loads(recognizer.FinalResult()).get("text", "")
+    if text:
+        yield text
+
+
+def wav_chunks(wav_file: wave.Wave_read, frames_per_chunk: int = 4000) -> Iterator[bytes]:
+    if wav_file.getnchannels() != 1 or wav_file.getsampwidth() != 2:
+        raise ValueError("Voice input must be mono 16-bit PCM WAV audio")
+    while True:
+        chunk = wav_file.readframes(frames_per_chunk)
+        if not chunk:
+            return
+        yield chunk
+
+
+def microphone_chunks(seconds: float = VOICE_RECORD_SECONDS, sample_rate: int = VOICE_SAMPLE_RATE, block_size: int = 4000) -> Iterator[bytes]:
+    import sounddevice  # Only needed for microphone input
+
+    with sounddevice.RawInputStream(samplerate=sample_rate, blocksize=block_size, dtype="int16", channels=1) as stream:
+        for _ in range(max(1, int(seconds * sample_rate / block_size))):
+            data, _ = stream.read(block_size)
+            yield bytes(data)
+
+
+def ingredients_from_transcript(text: str, vocabulary: Iterable[str]) -> List[Ingredient]:
+    # Greedy longest match of word windows whose canonical form is a catalog ingredient
+    vocabulary = set(vocabulary)
+    longest = max((len(phrase.split()) for phrase in itertools.chain(vocabulary, ALIAS_TABLE)), default=0)
+    words = [word for word in text.lower().split() if word != "[unk]"]
+    ingredients = []
+    position = 0
+    while position < len(words):
+        for size in range(min(longest, len(words) - position), 0, -1):
+            canonical = canonical_ingredient_name(" ".join(words[position : position + size]))
+            if canonical in vocabulary:
+                ingredients.append(Ingredient(canonical))
+                position += size
+                break
+        else:
+            position += 1
+    return list(dict.fromkeys(ingredients))
+
+
+def recognize_ingredients(engine: CachedAIEngine, chunks: Iterable[bytes], sample_rate: int) -> Tuple[str, List[Ingredient]]:
+    vocabulary, grammar = catalog_grammar(engine)
+    transcript = " ".join(transcribe_chunks(chunks, sample_rate, grammar))
+    return transcript, ingredients_from_transcript(transcript, vocabulary)
+
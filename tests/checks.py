@@ -0,0 +1,92 @@
+"""Helpers shared by the engine tests: random catalogs and queries, engine-to-engine comparison,
+and brute-force reference answers computed straight from the recipe list.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+
+STEP_WORDS = ["fry", "boil", "stir", "low", "heat", "onion", "rice", "simmer", "serve", "bake", "golden", "brown"]
+
+
+def ranked_names(results):
+    return [(recipe.name, round(score, 9)) for recipe, score in results]
+
+
+def random_recipe(rng, vocabulary, name):
+    ingredients = [core.Ingredient(ingredient) for ingredient in rng.sample(vocabulary, rng.randint(1, 6))]
+    steps = "\n".join(" ".join(rng.choices(STEP_WORDS, k=rng.randint(3, 8))) for _ in range(rng.randint(1, 3)))
+    return core.Recipe(name, ingredients, steps)
+
+
+def random_queries(rng, vocabulary, count=20):
+    return [[core.Ingredient(name) for name in rng.sample(vocabulary, rng.randint(1, 5))] for _ in range(count)]
+
+
+def assert_same_answers(engine, reference, rng, vocabulary, scorings=core.SCORING_METHODS):
+    for query in random_queries(rng, vocabulary):
+        assert [recipe.name for recipe in engine.suggest_recipes(query)] == [
+            recipe.name for recipe in reference.suggest_recipes(query)
+        ]
+        constraints = core.QueryConstraints(1, [query[0]])
+        for scoring in scorings:
+            assert ranked_names(engine.rank_recipes(query, 7, scoring)) == ranked_names(
+                reference.rank_recipes(query, 7, scoring)
+            )
+            assert ranked_names(engine.rank_recipes(query, 7, scoring, constraints)) == ranked_names(
+                reference.rank_recipes(query, 7, scoring, constraints)
+            )
+        for text in ("fry onion", '"low heat" simmer', "golden"):
+            assert ranked_names(engine.search_recipes(text, 5)) == ranked_names(reference.search_recipes(text, 5))
+            assert ranked_names(engine.search_recipes(text, 5, query)) == ranked_names(
+                reference.search_recipes(text, 5, query)
+            )
+    names = sorted({recipe.name for recipe in reference.live_recipes()})
+    for name in rng.sample(names, min(10, len(names))):
+        assert engine.get_recipe_by_name(name).name == name
+        assert engine.get_recipe_by_name(name[:-1] + "x", max_distance=2).name == reference.get_recipe_by_name(
+            name[:-1] + "x", max_distance=2
+        ).name
+        assert ranked_names(engine.similar_recipes(name)) == ranked_names(reference.similar_recipes(name))
+    for prefix in ("c", "ch", "pa", "zz"):
+        assert engine.complete_recipe_names(prefix) == reference.complete_recipe_names(prefix)
+    assert engine.recipe_count == reference.recipe_count
+
+
+def brute_force_rank(recipes, query, top_k, scoring, constraints=None):
+    # Coverage or Jaccard ranking by scanning every recipe; ties favour more matches, then catalog order
+    names = {ingredient.name for ingredient in query}
+    scored = []
+    for position, recipe in enumerate(recipes):
+        own = {ingredient.name for ingredient in recipe.ingredients}
+        matched = len(own & names)
+        if not matched:
+            continue
+        if constraints and (
+            not constraints.required <= own
+            or constraints.excluded & own
+            or (constraints.max_missing is not None and len(own - names) > constraints.max_missing)
+        ):
+            continue
+        score = matched / len(own) if scoring == "coverage" else matched / len(own | names)
+        scored.append((score, matched, -position))
+    best = sorted(scored, reverse=True)[:top_k]
+    return [(recipes[-neg_position].name, round(score, 9)) for score, _, neg_position in best]
+
+
+def assert_matches_brute_force(engine, rng, vocabulary, count=20):
+    recipes = list(engine.live_recipes())
+    for query in random_queries(rng, vocabulary, count):
+        query_names = {ingredient.name for ingredient in query}
+        expected = [recipe.name for recipe in recipes if {i.name for i in recipe.ingredients} & query_names]
+        assert [recipe.name for recipe in engine.suggest_recipes(query)] == expected
+        excluded = [core.Ingredient(rng.choice(vocabulary))]
+        for constraints in (None, core.QueryConstraints(1, [query[0]]), core.QueryConstraints(2, [], excluded)):
+            if constraints and constraints.required & constraints.excluded:
+                continue
+            for scoring in ("coverage", "jaccard"):
+                assert ranked_names(engine.rank_recipes(query, 7, scoring, constraints)) == brute_force_rank(
+                    recipes, query, 7, scoring, constraints
+                )
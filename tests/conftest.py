@@ -0,0 +1,19 @@
+"""Shared fixtures for the test suite.
+
+Usage: python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+
+
+@pytest.fixture
+def catalog():
+    recipes = core.initialize_recipes()
+    vocabulary = sorted({ingredient.name for recipe in recipes for ingredient in recipe.ingredients})
+    return recipes, vocabulary
@@ -0,0 +1,107 @@
+"""Query cache tests: cached answers equal the engine's, keys ignore ingredient order and
+duplicates, and entries go away on TTL expiry or a catalog update. Identical in-flight queries
+are computed once, and popular pantries from the query log are ranked ahead of time.
+
+Usage: python -m pytest tests
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+
+
+def test_cached_engine_serves_repeats_from_cache(catalog):
+    recipes, _ = catalog
+    engine = core.AIEngine(recipes)
+    cached = core.CachedAIEngine(engine)
+    rice, onion = core.Ingredient("rice"), core.Ingredient("onion")
+    first = cached.rank_recipes([rice, onion], 5)
+    assert cached.rank_recipes([onion, rice, rice], 5) == first == engine.rank_recipes([rice, onion], 5)
+    assert cached.suggest_recipes([rice]) == engine.suggest_recipes([rice])
+    assert cached.search_recipes("Fry  onion", 5) == cached.search_recipes("fry onion", 5)
+    info = cached.cache_info()
+    assert (info["hits"], info["misses"], info["size"]) == (2, 3, 3)
+
+
+def test_cached_engine_expires_entries(catalog):
+    recipes, _ = catalog
+    cached = core.CachedAIEngine(core.AIEngine(recipes), ttl=0.05)
+    pantry = [core.Ingredient("rice")]
+    cached.rank_recipes(pantry)
+    time.sleep(0.1)
+    cached.rank_recipes(pantry)
+    assert cached.cache_info()["misses"] == 2
+
+
+def test_cached_engine_drops_results_after_update(catalog):
+    recipes, _ = catalog
+    cached = core.CachedAIEngine(core.AIEngine(recipes))
+    pantry = [core.Ingredient("egg")]
+    before = cached.rank_recipes(pantry, 5)
+    cached.add_recipe(core.Recipe("egg only", pantry, "boil"))
+    after = cached.rank_recipes(pantry, 5)
+    assert after[0][0].name == "egg only" and after != before
+    assert cached.cache_info()["misses"] == 2
+
+
+def test_cached_engine_coalesces_identical_queries(catalog):
+    recipes, _ = catalog
+    engine = core.AIEngine(recipes)
+    cached = core.CachedAIEngine(engine)
+    calls = []
+    rank_recipes = engine.rank_recipes
+
+    def slow_rank(*args, **kwargs):
+        calls.append(True)
+        time.sleep(0.1)
+        return rank_recipes(*args, **kwargs)
+
+    engine.rank_recipes = slow_rank
+    pantry = [core.Ingredient("rice"), core.Ingredient("onion")]
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cached.rank_recipes(pantry))) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [rank_recipes(pantry)] * 16
+    assert cached.cache_info()["coalesced"] == 15
+
+
+def test_warmed_pantries_are_dropped_after_update(catalog):
+    recipes, _ = catalog
+    cached = core.CachedAIEngine(core.AIEngine(recipes))
+    pantry = [core.Ingredient("egg")]
+    cached.warm_up([pantry])
+    before = cached.rank_recipes(pantry, 5)
+    assert cached.cache_info()["misses"] == 0
+    cached.add_recipe(core.Recipe("egg only", pantry, "boil"))
+    after = cached.rank_recipes(pantry, 5)
+    assert after[0][0].name == "egg only" and after != before
+    assert cached.cache_info()["pinned"] == 0
+
+
+def test_popular_pantries_skips_malformed_log_lines(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    path.write_text(
+        "\n".join(
+            [
+                '{"ingredients": ["rice", null]}',
+                '{"ingredients": "rice"}',
+                "[1, 2]",
+                "{broken",
+                '{"ingredients": ["Rice", "eggs"]}',
+                '{"ingredients": ["egg", "rice"]}',
+                '{"ingredients": ["onion"]}',
+            ]
+        ),
+        encoding="utf-8",
+    )
+    pantries = core.popular_pantries(str(path))
+    assert [[ingredient.name for ingredient in pantry] for pantry in pantries] == [["egg", "rice"], ["onion"]]
+    assert core.create_engine(None, str(path)).cache_info()["pinned"] == 2
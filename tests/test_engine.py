@@ -0,0 +1,114 @@
+"""Incremental update tests: an updated engine must answer every query exactly like an AIEngine
+freshly built from the same live recipes, and like a plain scan of those recipes.
+
+Usage: python -m pytest tests
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+from checks import assert_matches_brute_force, assert_same_answers, random_recipe  # noqa: E402
+
+@pytest.mark.parametrize("warm_indexes", [True, False])
+def test_incremental_updates_match_rebuild(catalog, warm_indexes):
+    recipes, vocabulary = catalog
+    rng = random.Random(7)
+    engine = core.AIEngine(recipes)
+    if warm_indexes:  # Otherwise the lazy indexes are first built after the updates
+        engine.name_index, engine.step_index, engine.similarity_index
+    for step in range(60):
+        names = sorted({recipe.name for recipe in engine.live_recipes()})
+        operation = rng.random()
+        if operation < 0.35:
+            engine.remove_recipe(rng.choice(names))
+        elif operation < 0.7:
+            engine.add_recipe(random_recipe(rng, vocabulary, f"new dish {step}"))
+        else:
+            name = rng.choice(names)
+            engine.update_recipe(name, random_recipe(rng, vocabulary, name))
+        if step % 15 == 14:
+            assert_same_answers(engine, core.AIEngine(engine.live_recipes()), rng, vocabulary)
+            assert_matches_brute_force(engine, rng, vocabulary)
+    assert_same_answers(engine, core.AIEngine(engine.live_recipes()), rng, vocabulary)
+
+
+def test_removing_missing_or_removed_recipe_raises(catalog):
+    recipes, vocabulary = catalog
+    engine = core.AIEngine(recipes)
+    engine.remove_recipe("korma")
+    with pytest.raises(KeyError):
+        engine.remove_recipe("korma")
+    assert_same_answers(engine, core.AIEngine(engine.live_recipes()), random.Random(1), vocabulary)
+
+
+def test_concurrent_removals_remove_once(catalog):
+    recipes, vocabulary = catalog
+    engine = core.AIEngine(recipes)
+    failures = []
+
+    def remove():
+        try:
+            engine.remove_recipe("korma")
+        except KeyError:
+            failures.append(True)
+
+    engine.name_index  # Built up front, since building it takes the write lock too
+    threads = [threading.Thread(target=remove) for _ in range(8)]
+    with engine._write_lock:  # Every remover gets as far as it can before any of them writes
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+    for thread in threads:
+        thread.join()
+    assert len(failures) == 7
+    assert engine.recipe_count == len(recipes) - 1
+    assert_same_answers(engine, core.AIEngine(engine.live_recipes()), random.Random(2), vocabulary)
+
+
+@pytest.mark.parametrize("name", ["korma", "biryani"])  # The catalog has two biryanis
+def test_updated_recipe_stays_findable_by_name(catalog, name):
+    recipes, vocabulary = catalog
+    engine = core.AIEngine(recipes)
+    engine.name_index, engine.step_index, engine.similarity_index
+    misses = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            if engine.get_recipe_by_name(name) is None:
+                misses.append(True)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    rng = random.Random(4)
+    for _ in range(50):
+        engine.update_recipe(name, random_recipe(rng, vocabulary, name))
+    done.set()
+    reader.join()
+    assert not misses
+    assert_same_answers(engine, core.AIEngine(engine.live_recipes()), rng, vocabulary)
+
+
+def test_cached_engine_swaps_in_compacted_catalog(catalog, monkeypatch):
+    recipes, vocabulary = catalog
+    rng = random.Random(6)
+    cached = core.CachedAIEngine(core.AIEngine(recipes))
+    cached.name_index
+    pantry = [core.Ingredient("rice")]
+    before = cached.rank_recipes(pantry, 5, "tfidf")
+    monkeypatch.setattr(core, "COMPACT_DEAD_RATIO", 0.1)
+    names = sorted({recipe.name for recipe in recipes})
+    for name in names[:12]:
+        cached.update_recipe(name, random_recipe(rng, vocabulary, name))
+    engine = cached.engine
+    assert engine._dead_recipes <= 0.1 * len(engine.recipes) < 12
+    assert engine._name_index is not None and engine._step_index is None
+    assert cached.rank_recipes(pantry, 5, "tfidf") != before
+    assert_same_answers(cached, core.AIEngine(engine.live_recipes()), rng, vocabulary)
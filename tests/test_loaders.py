@@ -0,0 +1,44 @@
+"""Catalog loader tests: strict mode stops at the first bad record, non-strict mode skips it.
+
+Usage: python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+
+MIXED_JSONL = "\n".join(
+    [
+        '{"name": "plain rice", "ingredients": ["rice", "water"], "steps": "1. Boil."}',
+        '{"name": "broken", "ingredients": [',
+        "[1, 2]",
+        '"just text"',
+        '{"name": "no ingredients", "ingredients": []}',
+        '{"name": "boiled egg", "ingredients": "egg;water"}',
+    ]
+)
+
+
+@pytest.fixture
+def mixed_catalog(tmp_path):
+    path = tmp_path / "catalog.jsonl"
+    path.write_text(MIXED_JSONL + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_non_strict_jsonl_skips_bad_records(mixed_catalog):
+    assert [recipe.name for recipe in core.load_recipes(mixed_catalog, strict=False)] == ["plain rice", "boiled egg"]
+
+
+def test_strict_jsonl_reports_first_bad_record(mixed_catalog):
+    with pytest.raises(ValueError, match="record 2"):
+        list(core.load_recipes(mixed_catalog))
+
+
+def test_non_object_record_is_rejected():
+    with pytest.raises(ValueError, match="must be an object"):
+        core.recipe_from_record([1, 2])
@@ -0,0 +1,65 @@
+"""Ingredient normalization tests: plurals, aliases and descriptors share one canonical key,
+while recipes keep the ingredient text as written for display.
+
+Usage: python -m pytest tests
+"""
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "written, canonical",
+    [
+        ("Tomatoes", "tomato"),
+        ("potatoes", "potato"),
+        ("onions", "onion"),
+        ("berries", "berry"),
+        ("peaches", "peach"),
+        ("dishes", "dish"),
+        ("boxes", "box"),
+        ("leaves", "leaf"),
+        ("green chillies", "green chili"),
+        ("cookies", "cookie"),
+        ("pies", "pie"),
+        ("brownies", "brownie"),
+        ("quiches", "quiche"),
+        ("brioches", "brioche"),
+        ("hummus", "hummus"),
+        ("asparagus", "asparagus"),
+        ("glass", "glass"),
+        ("peas", "pea"),
+    ],
+)
+def test_plurals_share_the_singular_key(written, canonical):
+    assert core.canonical_ingredient_name(written) == canonical
+
+
+def test_aliases_and_descriptors_map_to_one_key():
+    assert core.canonical_ingredient_name("cilantro") == core.canonical_ingredient_name("coriander")
+    assert core.canonical_ingredient_name("lentils") == core.canonical_ingredient_name("dal")
+    assert core.canonical_ingredient_name("fresh  Chopped onions") == "onion"
+
+
+def test_recipe_keeps_ingredients_as_written():
+    recipe = core.Recipe("Dal Tadka", ["Lentils", "cilantro", "  onion ", core.Ingredient("ghee")], "Simmer.")
+    assert [ingredient.name for ingredient in recipe.ingredients] == ["dal", "coriander", "onion", "ghee"]
+    assert recipe.ingredient_labels == ["Lentils", "cilantro", "onion", "ghee"]
+    restored = pickle.loads(pickle.dumps(recipe))
+    assert (restored.ingredients, restored.ingredient_labels) == (recipe.ingredients, recipe.ingredient_labels)
+    assert core.Recipe("plain rice", ["rice"], "Boil.").labels is None
+
+
+def test_snapshot_keeps_ingredient_labels(tmp_path):
+    recipes = [core.Recipe("dal tadka", ["Lentils", "cilantro"], "Simmer."), core.Recipe("rice", ["rice"], "Boil.")]
+    path = str(tmp_path / "catalog.snapshot")
+    core.write_snapshot(core.AIEngine(recipes), path)
+    snapshot = core.open_snapshot(path)
+    assert [recipe.ingredient_labels for recipe in snapshot.live_recipes()] == [["Lentils", "cilantro"], ["rice"]]
+    assert pickle.loads(pickle.dumps(snapshot.recipes[0])).ingredient_labels == ["Lentils", "cilantro"]
@@ -0,0 +1,49 @@
+"""Similarity tests: "more like this" scores are exact ingredient Jaccard similarities, and close
+neighbours are always among the LSH candidates, checked against an all-pairs brute force.
+
+Usage: python -m pytest tests
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+
+
+def ingredient_names(recipe):
+    return {ingredient.name for ingredient in recipe.ingredients}
+
+
+def test_similar_recipes_match_brute_force(catalog):
+    recipes, vocabulary = catalog
+    rng = random.Random(11)
+    # Near copies of catalog recipes, one ingredient swapped, so every recipe has close neighbours
+    variants = []
+    for recipe in rng.sample(recipes, 30):
+        names = sorted(ingredient_names(recipe))
+        names[rng.randrange(len(names))] = rng.choice(vocabulary)
+        variants.append(core.Recipe(f"{recipe.name} variant", names, recipe.steps))
+    engine = core.AIEngine(recipes + variants)
+    catalog_recipes = list(engine.live_recipes())
+    checked = []
+    for recipe in catalog_recipes:
+        if engine.get_recipe_by_name(recipe.name) is not recipe:  # Later recipes sharing a name are not looked up
+            continue
+        own = ingredient_names(recipe)
+        exact = {  # Keyed by object: a few catalog names occur twice
+            id(other): len(own & ingredient_names(other)) / len(own | ingredient_names(other))
+            for other in catalog_recipes if other.name != recipe.name
+        }
+        similar = engine.similar_recipes(recipe.name, 5)
+        scores = [score for _, score in similar]
+        assert scores == sorted(scores, reverse=True)
+        for other, score in similar:
+            assert other.name != recipe.name and score == exact[id(other)]
+        best = max(exact.values())
+        if best >= 0.75:  # Sharing a band is near certain at this similarity, so the best match must be found
+            assert scores[0] == best
+            checked.append(recipe.name)
+    assert len(checked) >= 10
+    assert engine.similar_recipes("no such dish") == []
@@ -0,0 +1,52 @@
+"""Snapshot tests: an engine opened from a compiled snapshot answers like the engine it was
+compiled from, and like a plain scan of its recipes.
+
+Usage: python -m pytest tests
+"""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+from checks import assert_matches_brute_force, assert_same_answers, random_recipe  # noqa: E402
+
+
+@pytest.fixture
+def snapshot_and_reference(catalog, tmp_path):
+    recipes, vocabulary = catalog
+    engine = core.AIEngine(recipes)
+    engine.remove_recipe("korma")
+    engine.add_recipe(random_recipe(random.Random(3), vocabulary, "snapshot special"))
+    path = str(tmp_path / "catalog.snapshot")
+    core.write_snapshot(engine, path)
+    return core.open_snapshot(path), core.AIEngine(engine.live_recipes())
+
+
+def test_snapshot_round_trip(catalog, snapshot_and_reference):
+    recipes, vocabulary = catalog
+    snapshot, reference = snapshot_and_reference
+    assert_same_answers(snapshot, reference, random.Random(3), vocabulary)
+    for mapped, built in zip(snapshot.live_recipes(), reference.live_recipes()):
+        assert (mapped.name, mapped.ingredients, mapped.steps) == (built.name, built.ingredients, built.steps)
+    with pytest.raises(RuntimeError):
+        snapshot.add_recipe(recipes[0])
+
+
+def test_snapshot_matches_brute_force(catalog, snapshot_and_reference):
+    _, vocabulary = catalog
+    snapshot, _ = snapshot_and_reference
+    assert_matches_brute_force(snapshot, random.Random(8), vocabulary)
+    names = [recipe.name for recipe in snapshot.live_recipes()]
+    for name in names[:20]:
+        typo = name[:-1] + "x"
+        expected = sorted(
+            (distance, other) for other in set(names)
+            if (distance := core.RecipeNameIndex._bounded_edit_distance(typo, other, 2)) is not None
+        )[:5]
+        assert snapshot.name_index.fuzzy(typo, 2) == [(other, distance) for distance, other in expected]
+        completions = sorted(other for other in set(names) if other.startswith(name[:2]))[:10]
+        assert snapshot.complete_recipe_names(name[:2]) == completions
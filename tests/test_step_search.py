@@ -0,0 +1,96 @@
+"""Step search tests: BM25 scores and phrase matches from the positional index equal a brute-force
+evaluation over the live recipes' tokenized steps, including after removals and updates.
+
+Usage: python -m pytest tests
+"""
+import math
+import os
+import random
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+
+WORDS = ["fry", "boil", "stir", "low", "heat", "onion", "onions", "rice", "simmer", "serve", "golden", "pan", "oil"]
+QUERIES = ["fry onion", '"low heat" simmer', "golden", '"stir fry" "pan oil"', "rice oil pan", '"onions"', "zzz"]
+
+
+def random_recipe(rng, name):
+    ingredients = rng.sample(["rice", "egg", "onion", "salt", "oil", "milk"], rng.randint(1, 4))
+    return core.Recipe(name, ingredients, " ".join(rng.choices(WORDS, k=rng.randint(2, 30))))
+
+
+def brute_force_search(engine, query, top_k, allowed=None):
+    live = {recipe_id: recipe for recipe_id, recipe in enumerate(engine.recipes) if engine._live[recipe_id]}
+    tokens = {recipe_id: core.StepTextIndex.tokenize(recipe.steps) for recipe_id, recipe in live.items()}
+    count = len(tokens)
+    phrases = [terms for terms in map(core.StepTextIndex.tokenize, re.findall(r'"([^"]*)"', query)) if terms]
+    terms = dict.fromkeys(core.StepTextIndex.tokenize(re.sub(r'"[^"]*"', " ", query)))
+    terms.update(dict.fromkeys(term for phrase in phrases for term in phrase))
+    kept = {recipe_id for recipe_id in tokens if allowed is None or live[recipe_id].name in allowed}
+    for phrase in phrases:
+        kept = {
+            recipe_id for recipe_id in kept
+            if any(tokens[recipe_id][start : start + len(phrase)] == phrase for start in range(len(tokens[recipe_id])))
+        }
+    length_base = core.BM25_K1 * (1 - core.BM25_B)
+    length_scale = core.BM25_K1 * core.BM25_B / (sum(map(len, tokens.values())) / count)
+    scores = {}
+    for term in terms:
+        frequency = sum(1 for document in tokens.values() if term in document)
+        if not frequency:
+            continue
+        weight = (core.BM25_K1 + 1) * math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+        for recipe_id in kept:
+            tf = tokens[recipe_id].count(term)
+            if tf:
+                score = weight * tf / (tf + length_base + length_scale * len(tokens[recipe_id]))
+                scores[recipe_id] = scores.get(recipe_id, 0.0) + score
+    best = sorted(scores.items(), key=lambda entry: (-entry[1], entry[0]))[:top_k]
+    return [(engine.recipes[recipe_id].name, round(score, 9)) for recipe_id, score in best]
+
+
+def searched(results):
+    return [(recipe.name, round(score, 9)) for recipe, score in results]
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_search_matches_brute_force_through_updates(seed):
+    rng = random.Random(seed)
+    engine = core.AIEngine([random_recipe(rng, f"dish {i}") for i in range(120)])
+    engine.step_index
+    pantry = [core.Ingredient("rice"), core.Ingredient("egg")]
+    constraints = core.QueryConstraints(3, [core.Ingredient("onion")], [core.Ingredient("milk")])
+    for step in range(15):
+        names = [recipe.name for recipe in engine.live_recipes()]
+        operation = rng.random()
+        if operation < 0.4:
+            engine.remove_recipe(rng.choice(names))
+        elif operation < 0.7:
+            engine.add_recipe(random_recipe(rng, f"new dish {step}"))
+        else:
+            name = rng.choice(names)
+            engine.update_recipe(name, random_recipe(rng, name))
+        for query in QUERIES:
+            for top_k in (1, 5, 50):
+                assert searched(engine.search_recipes(query, top_k)) == brute_force_search(engine, query, top_k)
+            allowed = {recipe.name for recipe in engine.suggest_recipes(pantry)}
+            assert searched(engine.search_recipes(query, 5, pantry)) == brute_force_search(engine, query, 5, allowed)
+            allowed = {recipe.name for recipe in engine.suggest_recipes(pantry, None, "coverage", constraints)}
+            assert searched(engine.search_recipes(query, 5, pantry, constraints)) == brute_force_search(
+                engine, query, 5, allowed
+            )
+    # Without a pantry, constraints alone restrict the search: every ingredient counts as missing
+    constraints = core.QueryConstraints(2, [], [core.Ingredient("milk")])
+    allowed = {
+        recipe.name for recipe in engine.live_recipes()
+        if len(recipe.ingredients) <= 2 and core.Ingredient("milk") not in recipe.ingredients
+    }
+    for query in QUERIES:
+        assert searched(engine.search_recipes(query, 5, None, constraints)) == brute_force_search(
+            engine, query, 5, allowed
+        )
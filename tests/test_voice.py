@@ -0,0 +1,27 @@
+"""Voice grammar tests: the recognizer grammar covers the ways a pantry is spoken, and every phrase
+in it maps back to a catalog ingredient.
+
+Usage: python -m pytest tests
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recipe_core as core  # noqa: E402
+import recipe_voice as voice  # noqa: E402
+
+
+def test_grammar_includes_plural_and_catalog_forms():
+    engine = core.CachedAIEngine(core.AIEngine(core.initialize_recipes()))
+    vocabulary, grammar = voice.catalog_grammar(engine)
+    phrases = json.loads(grammar)
+    for spoken in ("tomatoes", "onions", "potatoes", "spices", "green chilies", "lentils", "cilantro"):
+        assert spoken in phrases
+    assert all(core.canonical_ingredient_name(phrase) in vocabulary for phrase in phrases if phrase != "[unk]")
+    assert voice.ingredients_from_transcript("lentils green chilies tomatoes", vocabulary) == [
+        core.Ingredient("lentil"),
+        core.Ingredient("green chili"),
+        core.Ingredient("tomato"),
+    ]
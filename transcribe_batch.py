@@ -0,0 +1,121 @@
+"""Turn a directory of recorded voice orders into recipe suggestions.
+
+Usage: python transcribe_batch.py recordings/ suggestions.jsonl [--workers 4] [--top-k 5]
+
+Each WAV file (mono 16-bit PCM) is decoded with the bundled Vosk model in a process pool,
+with one model and one recognizer per worker. Transcripts are normalized to catalog
+ingredients, queried against the engine and written as one JSON line per file.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import recipe_core as core
+import recipe_voice as voice
+
+# Per-worker state, set up once by _init_worker
+_grammar = None
+_model_path = None
+_recognizers = {}
+
+
+def _init_worker(grammar: str, model_path: str):
+    global _grammar, _model_path
+    _grammar = grammar
+    _model_path = model_path
+    voice.load_vosk_model(model_path)
+
+
+def _recognizer(sample_rate: int):
+    # One recognizer per sample rate, reset between files instead of rebuilt
+    import vosk
+
+    recognizer = _recognizers.get(sample_rate)
+    if recognizer is None:
+        recognizer = _recognizers[sample_rate] = vosk.KaldiRecognizer(
+            voice.load_vosk_model(_model_path), sample_rate, _grammar
+        )
+    else:
+        recognizer.Reset()
+    return recognizer
+
+
+def decode_file(path: str) -> dict:
+    started = time.perf_counter()
+    try:
+        with wave.open(path, "rb") as wav_file:
+            audio_seconds = wav_file.getnframes() / wav_file.getframerate()
+            recognizer = _recognizer(wav_file.getframerate())
+            texts = []
+            for chunk in voice.wav_chunks(wav_file):
+                if recognizer.AcceptWaveform(chunk):
+                    texts.append(json.loads(recognizer.Result()).get("text", ""))
+            texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+    except (wave.Error, ValueError, EOFError) as error:
+        return {"file": path, "error": str(error) or type(error).__name__, "audio_seconds": 0.0, "decode_seconds": time.perf_counter() - started}
+    return {
+        "file": path,
+        "transcript": " ".join(text for text in texts if text),
+        "audio_seconds": audio_seconds,
+        "decode_seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch-transcribe recorded ingredient lists into recipe suggestions")
+    parser.add_argument("input_dir", help="directory containing .wav recordings")
+    parser.add_argument("output", help="JSONL file to write, or - for stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top-k", type=int, default=core.MAX_SUGGESTIONS)
+    parser.add_argument("--scoring", choices=core.SCORING_METHODS, default="coverage")
+    parser.add_argument("--catalog", default=core.RECIPE_CATALOG_PATH, help=".jsonl, .csv, .parquet or .snapshot file")
+    parser.add_argument("--model", default=voice.VOSK_MODEL_PATH)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.input_dir, "*.wav")))
+    if not paths:
+        parser.error(f"no .wav files found in {args.input_dir}")
+    try:
+        voice.load_vosk_model(args.model)  # Fail fast here rather than inside every worker
+    except Exception as error:
+        parser.error(f"cannot load Vosk model from {args.model}: {error}")
+    engine = core.create_engine(args.catalog)
+    vocabulary, grammar = voice.catalog_grammar(engine)
+
+    started = time.perf_counter()
+    audio_seconds = decode_seconds = 0.0
+    failures = 0
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(grammar, args.model)) as pool:
+            for result in pool.map(decode_file, paths, chunksize=4):
+                audio_seconds += result["audio_seconds"]
+                decode_seconds += result["decode_seconds"]
+                if "error" in result:
+                    failures += 1
+                else:
+                    ingredients = voice.ingredients_from_transcript(result["transcript"], vocabulary)
+                    ranked = engine.rank_recipes(ingredients, top_k=args.top_k, scoring=args.scoring) if ingredients else []
+                    result["ingredients"] = [ingredient.name for ingredient in ingredients]
+                    result["suggestions"] = [{"name": recipe.name, "score": round(score, 4)} for recipe, score in ranked]
+                output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    real_time_factor = decode_seconds / audio_seconds if audio_seconds else 0.0
+    print(
+        f"{len(paths)} files ({failures} failed), {audio_seconds:.1f} s of audio in {elapsed:.1f} s: "
+        f"{len(paths) / elapsed:.2f} files/s, real-time factor {real_time_factor:.3f} per worker",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from recipe_core import MAX_SUGGESTIONS, SCORING_METHODS, Ingredient, QueryConstraints, Recipe, RecipeNameIndex
+
+BATCH_BLOCK_ENTRIES = 1 << 16  # CSR entries per block in match_counts_batch; bounds its temporaries
+
+
+# Drop-in alternative to AIEngine's read-only queries: the catalog is kept as a sparse recipe x ingredient
+# matrix (CSR layout) and every query is answered with array operations over all recipes.
+class VectorizedAIEngine:
+    def __init__(self, recipes: List[Recipe]):
+        self.recipes = recipes
+        # Vocabulary: ingredient name -> column
+        self.vocabulary: Dict[str, int] = {}
+        indptr = [0]
+        indices = []
+        for recipe in recipes:
+            columns = {self.vocabulary.setdefault(ing.name, len(self.vocabulary)) for ing in recipe.ingredients}
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.row_of_entry = np.repeat(np.arange(len(recipes), dtype=np.int32), np.diff(self.indptr))
+        self.ingredient_counts = np.diff(self.indptr).astype(np.int32)
+
+        # Smoothed IDF per column, same formula as AIEngine
+        document_frequency = np.bincount(self.indices, minlength=len(self.vocabulary))
+        self.idf = np.log((1 + len(recipes)) / (1 + document_frequency)) + 1.0
+        self.recipe_weights = np.bincount(self.row_of_entry, weights=self.idf[self.indices], minlength=len(recipes))
+        self.name_index = RecipeNameIndex(recipes)
+
+    def _query_mask(self, available_ingredients: Iterable[Ingredient]) -> np.ndarray:
+        return self._names_mask(ing.name for ing in available_ingredients)
+
+    def _names_mask(self, names: Iterable[str]) -> np.ndarray:
+        mask = np.zeros(len(self.vocabulary), dtype=bool)
+        columns = [self.vocabulary[name] for name in names if name in self.vocabulary]
+        mask[columns] = True
+        return mask
+
+    def _allowed(self, counts: np.ndarray, constraints: Optional[QueryConstraints]) -> np.ndarray:
+        # Recipes sharing an ingredient with the pantry that also satisfy the constraints
+        allowed = counts > 0
+        if not constraints:
+            return allowed
+        if constraints.required:
+            required = self._row_sums(self._names_mask(constraints.required)[self.indices])
+            allowed &= required == len(constraints.required)
+        if constraints.excluded:
+            allowed &= self._row_sums(self._names_mask(constraints.excluded)[self.indices]) == 0
+        if constraints.max_missing is not None:
+            allowed &= self.ingredient_counts - counts <= constraints.max_missing
+        return allowed
+
+    def _row_sums(self, entry_values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.row_of_entry, weights=entry_values, minlength=len(self.recipes))
+
+    def match_counts(self, available_ingredients: List[Ingredient]) -> np.ndarray:
+        mask = self._query_mask(available_ingredients)
+        return self._row_sums(mask[self.indices]).astype(np.int32)
+
+    def coverage_scores(self, available_ingredients: List[Ingredient], scoring: str = "coverage") -> np.ndarray:
+        if scoring not in SCORING_METHODS:
+            raise ValueError(f"Unknown scoring method {scoring!r}, expected one of {SCORING_METHODS}")
+        mask = self._query_mask(available_ingredients)
+        hits = mask[self.indices]
+        counts = np.maximum(self.ingredient_counts, 1)
+        if scoring == "coverage":
+            return self._row_sums(hits) / counts
+        if scoring == "jaccard":
+            matched = self._row_sums(hits)
+            query_size = len({ing.name for ing in available_ingredients})
+            return matched / (counts + query_size - matched)
+        return self._row_sums(hits * self.idf[self.indices]) / np.maximum(self.recipe_weights, 1e-12)
+
+    def missing_counts(self, available_ingredients: List[Ingredient]) -> np.ndarray:
+        return self.ingredient_counts - self.match_counts(available_ingredients)
+
+    def suggest_recipes(
+        self,
+        available_ingredients: List[Ingredient],
+        top_k: Optional[int] = None,
+        scoring: str = "coverage",
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[Recipe]:
+        if top_k is not None:
+            return [recipe for recipe, _ in self.rank_recipes(available_ingredients, top_k, scoring, constraints)]
+        recipe_ids = np.flatnonzero(self._allowed(self.match_counts(available_ingredients), constraints))
+        return [self.recipes[recipe_id] for recipe_id in recipe_ids]
+
+    def rank_recipes(
+        self,
+        available_ingredients: List[Ingredient],
+        top_k: int = MAX_SUGGESTIONS,
+        scoring: str = "coverage",
+        constraints: Optional[QueryConstraints] = None,
+    ) -> List[Tuple[Recipe, float]]:
+        scores = self.coverage_scores(available_ingredients, scoring)
+        if top_k <= 0:
+            return []
+        counts = self.match_counts(available_ingredients)
+        candidates = np.flatnonzero(self._allowed(counts, constraints))
+        if len(candidates) > top_k:
+            # Partial selection of the best top_k before the exact (stable) ordering below
+            threshold = np.partition(scores[candidates], -top_k)[-top_k]
+            candidates = candidates[scores[candidates] >= threshold]
+        ranked = heapq.nlargest(
+            top_k, candidates.tolist(), key=lambda recipe_id: (scores[recipe_id], counts[recipe_id], -recipe_id)
+        )
+        return [(self.recipes[recipe_id], float(scores[recipe_id])) for recipe_id in ranked]
+
+    def recipes_missing_at_most(self, available_ingredients: List[Ingredient], max_missing: int) -> List[Recipe]:
+        counts = self.match_counts(available_ingredients)
+        makeable = (counts > 0) & (self.ingredient_counts - counts <= max_missing)
+        return [self.recipes[recipe_id] for recipe_id in np.flatnonzero(makeable)]
+
+    def match_counts_batch(
+        self, pantries: List[List[Ingredient]], block_entries: int = BATCH_BLOCK_ENTRIES
+    ) -> np.ndarray:
+        # One (pantries x recipes) count matrix for a whole batch of pantry profiles
+        masks = np.zeros((len(pantries), len(self.vocabulary)), dtype=bool)
+        for row, pantry in enumerate(pantries):
+            masks[row] = self._query_mask(pantry)
+        counts = np.empty((len(pantries), len(self.recipes)), dtype=np.int32)
+        running = np.zeros((len(pantries), block_entries + 1), dtype=np.int32)
+        # Recipes are taken in blocks of about block_entries CSR entries, so the temporaries stay
+        # (pantries x block_entries) however large the catalog is
+        start = 0
+        while start < len(self.recipes):
+            stop = int(np.searchsorted(self.indptr, self.indptr[start] + block_entries, side="right")) - 1
+            stop = min(max(stop, start + 1), len(self.recipes))
+            first, last = self.indptr[start], self.indptr[stop]
+            if last - first > block_entries:  # A single recipe larger than the block
+                running = np.zeros((len(pantries), last - first + 1), dtype=np.int32)
+            # Rows are contiguous in CSR order, so per-recipe sums are differences of a running total
+            np.cumsum(masks[:, self.indices[first:last]], axis=1, out=running[:, 1 : last - first + 1])
+            counts[:, start:stop] = (
+                running[:, self.indptr[start + 1 : stop + 1] - first] - running[:, self.indptr[start:stop] - first]
+            )
+            start = stop
+        return counts
+
+    def get_recipe_by_name(self, recipe_name: str, max_distance: int = 0) -> Optional[Recipe]:
+        recipe_name = recipe_name.strip().lower()
+        recipe_id = self.name_index.get(recipe_name)
+        if recipe_id is None and max_distance > 0:  # Typo-tolerant fallback, as in AIEngine
+            matches = self.name_index.fuzzy(recipe_name, max_distance, limit=1)
+            if matches:
+                recipe_id = self.name_index.get(matches[0][0])
+        return None if recipe_id is None else self.recipes[recipe_id]